@@ -2,12 +2,21 @@ from flask import Flask, jsonify, request
 from collections import OrderedDict
 from flask_cors import CORS
 import pandas as pd
+import numpy as np
+import hmac
 import os
 
+import datasets
+from cache import cached, responses
 import netflix
 import happiness
 import energy
 import ipl
+import athlete_search
+import autocomplete
+import recommender
+import netflix_browse
+import warmup
 
 # Import all functions
 from olympic_api_functions import (
@@ -33,7 +42,8 @@ from olympic_api_functions import (
     get_sport_monopoly,
     get_extinct_sports,
     get_home_advantage_analysis,
-    get_boycott_impact
+    get_boycott_impact,
+    generate_all_insights
 )
 
 from olympic_advanced_insights import (
@@ -52,19 +62,16 @@ from olympic_advanced_insights import (
     get_seasonal_crossover_athletes,
     get_age_sweet_spot_by_sport,
     get_first_time_medal_winners,
-    get_dropout_rate_by_sport
+    get_dropout_rate_by_sport,
+    generate_advanced_insights
 )
+from olympic_tables import rows_by_sport
 
 app = Flask(__name__)
 CORS(app)
 
-# Load dataset globally (use a file in the backend folder)
-data_path = os.path.join(os.path.dirname(__file__), 'athlete_events.csv')
-if os.path.exists(data_path):
-    df = pd.read_csv(data_path)
-else:
-    # Fallback to an empty DataFrame to avoid immediate crashes; endpoints should handle empty df.
-    df = pd.DataFrame()
+# Shared Olympic dataset (the registry falls back to an empty DataFrame if the CSV is missing)
+df = datasets.olympics()
 
 # ==========================================
 # ROOT & INFO ENDPOINTS
@@ -80,7 +87,8 @@ def home():
         'total_athletes': df['ID'].nunique(),
         'total_countries': df['NOC'].nunique(),
         'documentation': '/api/docs',
-        'health_check': '/health'
+        'health_check': '/health',
+        'dataset_stats': '/api/datasets'
     })
 
 
@@ -93,6 +101,20 @@ def health():
     })
 
 
+@app.route('/api/datasets')
+def dataset_stats():
+    return jsonify({
+        'datasets': datasets.stats()
+    })
+
+
+@app.route('/api/cache')
+def cache_stats():
+    return jsonify({
+        'response_cache': responses.stats()
+    })
+
+
 @app.route('/api/docs')
 def documentation():
     return jsonify({
@@ -140,6 +162,8 @@ def documentation():
                 {'path': '/api/insights/age-sweet-spot'},
                 {'path': '/api/insights/gold-rush'},
                 {'path': '/api/insights/boycott-impact'},
+                {'path': '/api/insights/all'},
+                {'path': '/api/insights/advanced'},
             ],
             'names': [
                 {'path': '/api/names/common'},
@@ -148,8 +172,9 @@ def documentation():
                 {'path': '/api/names/trends'},
             ],
             'search': [
-                {'path': '/api/search/athlete', 'params': 'name (required)'},
+                {'path': '/api/search/athlete', 'params': 'name (required), limit, offset'},
                 {'path': '/api/search/sport', 'params': 'sport (required)'},
+                {'path': '/api/autocomplete/<vocabulary>', 'params': 'q, limit (optional, default=10)'},
             ]
         }
     })
@@ -160,6 +185,7 @@ def documentation():
 # ==========================================
 
 @app.route('/api/medals/top-countries', methods=['GET'])
+@cached('olympics', warm=True)
 def top_countries():
     top_n = request.args.get('top_n', default=10, type=int)
     result = get_top_countries_alltime(top_n)
@@ -167,6 +193,7 @@ def top_countries():
 
 
 @app.route('/api/medals/country/<noc>', methods=['GET'])
+@cached('olympics')
 def country_medals(noc):
     year = request.args.get('year', type=int)
     result = get_country_medals_by_year(noc.upper(), year)
@@ -174,6 +201,7 @@ def country_medals(noc):
 
 
 @app.route('/api/medals/rankings', methods=['GET'])
+@cached('olympics')
 def medal_rankings():
     year = request.args.get('year', type=int)
     season = request.args.get('season', default='Summer', type=str)
@@ -190,6 +218,7 @@ def medal_rankings():
 # ==========================================
 
 @app.route('/api/athletes/top-decorated', methods=['GET'])
+@cached('olympics', warm=True)
 def top_decorated():
     top_n = request.args.get('top_n', default=10, type=int)
     result = get_most_decorated_athletes(top_n)
@@ -197,36 +226,42 @@ def top_decorated():
 
 
 @app.route('/api/athletes/youngest-oldest', methods=['GET'])
+@cached('olympics', warm=True)
 def youngest_oldest():
     result = get_youngest_oldest_medalists()
     return jsonify(result)
 
 
 @app.route('/api/athletes/most-experienced', methods=['GET'])
+@cached('olympics', warm=True)
 def most_experienced():
     result = get_most_experienced_athletes()
     return jsonify(result)
 
 
 @app.route('/api/athletes/comebacks', methods=['GET'])
+@cached('olympics', warm=True)
 def comebacks():
     result = get_comeback_athletes()
     return jsonify(result)
 
 
 @app.route('/api/athletes/one-hit-wonders', methods=['GET'])
+@cached('olympics', warm=True)
 def one_hit_wonders():
     result = get_one_hit_wonders()
     return jsonify(result)
 
 
 @app.route('/api/athletes/age-defying', methods=['GET'])
+@cached('olympics', warm=True)
 def age_defying():
     result = get_age_defying_athletes()
     return jsonify(result)
 
 
 @app.route('/api/athletes/crossover', methods=['GET'])
+@cached('olympics', warm=True)
 def crossover_athletes():
     result = get_seasonal_crossover_athletes()
     return jsonify(result)
@@ -237,6 +272,7 @@ def crossover_athletes():
 # ==========================================
 
 @app.route('/api/sports/physical-stats', methods=['GET'])
+@cached('olympics', warm=True)
 def physical_stats():
     sport = request.args.get('sport', type=str)
     result = get_physical_stats_by_sport(sport)
@@ -244,36 +280,42 @@ def physical_stats():
 
 
 @app.route('/api/sports/evolution', methods=['GET'])
+@cached('olympics', warm=True)
 def sport_evolution():
     result = get_sport_evolution()
     return jsonify(result)
 
 
 @app.route('/api/sports/extinct', methods=['GET'])
+@cached('olympics', warm=True)
 def extinct_sports():
     result = get_extinct_sports()
     return jsonify(result)
 
 
 @app.route('/api/sports/monopoly', methods=['GET'])
+@cached('olympics', warm=True)
 def sport_monopoly():
     result = get_sport_monopoly()
     return jsonify(result)
 
 
 @app.route('/api/sports/dominant/<sport>', methods=['GET'])
+@cached('olympics')
 def dominant_in_sport(sport):
     result = get_dominant_countries_per_sport(sport)
     return jsonify(result)
 
 
 @app.route('/api/sports/participation', methods=['GET'])
+@cached('olympics', warm=True)
 def sport_participation():
     result = get_participation_count_by_sport()
     return jsonify(result)
 
 
 @app.route('/api/sports/dropout-rate', methods=['GET'])
+@cached('olympics', warm=True)
 def dropout_rate():
     result = get_dropout_rate_by_sport()
     return jsonify(result)
@@ -284,18 +326,21 @@ def dropout_rate():
 # ==========================================
 
 @app.route('/api/countries/participation-growth', methods=['GET'])
+@cached('olympics', warm=True)
 def participation_growth():
     result = get_country_participation_growth()
     return jsonify(result)
 
 
 @app.route('/api/countries/underdog', methods=['GET'])
+@cached('olympics', warm=True)
 def underdog_nations():
     result = get_underdog_nations()
     return jsonify(result)
 
 
 @app.route('/api/countries/consistent', methods=['GET'])
+@cached('olympics', warm=True)
 def consistent_countries():
     min_olympics = request.args.get('min_olympics', default=10, type=int)
     result = get_consistent_countries(min_olympics)
@@ -303,12 +348,14 @@ def consistent_countries():
 
 
 @app.route('/api/countries/medal-droughts', methods=['GET'])
+@cached('olympics', warm=True)
 def medal_droughts():
     result = get_medal_droughts()
     return jsonify(result)
 
 
 @app.route('/api/countries/conversion-rate', methods=['GET'])
+@cached('olympics')
 def conversion_rate():
     year = request.args.get('year', type=int)
     season = request.args.get('season', default='Summer', type=str)
@@ -321,6 +368,7 @@ def conversion_rate():
 
 
 @app.route('/api/countries/small-success', methods=['GET'])
+@cached('olympics', warm=True)
 def small_country_success():
     result = get_small_country_success()
     return jsonify(result)
@@ -331,12 +379,14 @@ def small_country_success():
 # ==========================================
 
 @app.route('/api/demographics/gender-trend', methods=['GET'])
+@cached('olympics', warm=True)
 def gender_trend():
     result = get_gender_participation_trend()
     return jsonify(result)
 
 
 @app.route('/api/demographics/gender-parity', methods=['GET'])
+@cached('olympics', warm=True)
 def gender_parity():
     year = request.args.get('year', type=int)
     result = get_gender_parity_by_country(year)
@@ -344,6 +394,7 @@ def gender_parity():
 
 
 @app.route('/api/demographics/gender-by-sport', methods=['GET'])
+@cached('olympics', warm=True)
 def gender_by_sport():
     result = get_gender_parity_by_sport()
     return jsonify(result)
@@ -354,18 +405,21 @@ def gender_by_sport():
 # ==========================================
 
 @app.route('/api/host/cities', methods=['GET'])
+@cached('olympics', warm=True)
 def host_cities():
     result = get_host_cities_list()
     return jsonify(result)
 
 
 @app.route('/api/host/home-advantage', methods=['GET'])
+@cached('olympics', warm=True)
 def home_advantage():
     result = get_home_advantage_analysis()
     return jsonify(result)
 
 
 @app.route('/api/host/season-comparison', methods=['GET'])
+@cached('olympics', warm=True)
 def season_comparison():
     result = get_summer_vs_winter_comparison()
     return jsonify(result)
@@ -376,24 +430,28 @@ def season_comparison():
 # ==========================================
 
 @app.route('/api/insights/bmi-analysis', methods=['GET'])
+@cached('olympics', warm=True)
 def bmi_analysis():
     result = get_bmi_analysis_by_sport()
     return jsonify(result)
 
 
 @app.route('/api/insights/physical-evolution/<sport>', methods=['GET'])
+@cached('olympics')
 def physical_evolution(sport):
     result = get_physical_changes_over_time(sport)
     return jsonify(result)
 
 
 @app.route('/api/insights/age-sweet-spot', methods=['GET'])
+@cached('olympics', warm=True)
 def age_sweet_spot():
     result = get_age_sweet_spot_by_sport()
     return jsonify(result)
 
 
 @app.route('/api/insights/gold-rush', methods=['GET'])
+@cached('olympics', warm=True)
 def gold_rush():
     threshold = request.args.get('threshold', default=20, type=int)
     result = get_gold_rush_moments(threshold)
@@ -401,16 +459,33 @@ def gold_rush():
 
 
 @app.route('/api/insights/boycott-impact', methods=['GET'])
+@cached('olympics', warm=True)
 def boycott_impact():
     result = get_boycott_impact()
     return jsonify(result)
 
 
+# Bundles of every insight above; the most expensive responses, so rendered at warm-up
+@app.route('/api/insights/all', methods=['GET'])
+@cached('olympics', warm=True)
+def all_insights():
+    result = generate_all_insights()
+    return jsonify(result)
+
+
+@app.route('/api/insights/advanced', methods=['GET'])
+@cached('olympics', warm=True)
+def advanced_insights():
+    result = generate_advanced_insights()
+    return jsonify(result)
+
+
 # ==========================================
 # NAME ANALYSIS ENDPOINTS
 # ==========================================
 
 @app.route('/api/names/common', methods=['GET'])
+@cached('olympics', warm=True)
 def common_names():
     top_n = request.args.get('top_n', default=20, type=int)
     result = get_most_common_names(top_n)
@@ -418,18 +493,21 @@ def common_names():
 
 
 @app.route('/api/names/lucky', methods=['GET'])
+@cached('olympics', warm=True)
 def lucky_names():
     result = get_lucky_names()
     return jsonify(result)
 
 
 @app.route('/api/names/family-legacies', methods=['GET'])
+@cached('olympics', warm=True)
 def family_legacies():
     result = get_surname_analysis()
     return jsonify(result)
 
 
 @app.route('/api/names/trends', methods=['GET'])
+@cached('olympics', warm=True)
 def name_trends():
     result = get_name_trends_by_decade()
     return jsonify(result)
@@ -440,6 +518,7 @@ def name_trends():
 # ==========================================
 
 @app.route('/api/achievements/first-timers/<int:year>', methods=['GET'])
+@cached('olympics')
 def first_timers(year):
     result = get_first_time_medal_winners(year)
     return jsonify(result)
@@ -450,38 +529,42 @@ def first_timers(year):
 # ==========================================
 
 @app.route('/api/search/athlete', methods=['GET'])
+@cached('olympics')
 def search_athlete():
     name = request.args.get('name', type=str)
     if not name:
         return jsonify({'error': 'Name parameter required'}), 400
-    
-    results = df[df['Name'].str.contains(name, case=False, na=False)]
-    
-    if results.empty:
+
+    limit = request.args.get('limit', default=athlete_search.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), athlete_search.MAX_LIMIT)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+
+    total, athletes = athlete_search.search(name, limit=limit, offset=offset)
+
+    if total == 0:
         return jsonify({'message': 'No athletes found', 'query': name})
-    
-    athletes = results.groupby(['ID', 'Name', 'Team', 'Sex']).agg({
-        'Year': lambda x: sorted(x.unique().tolist()),
-        'Medal': lambda x: x.notna().sum(),
-        'Sport': lambda x: x.unique().tolist()
-    }).reset_index()
-    
-    athletes.columns = ['ID', 'Name', 'Team', 'Sex', 'Years', 'Total_Medals', 'Sports']
-    
+
     return jsonify({
         'query': name,
-        'total_results': len(athletes),
-        'athletes': athletes.to_dict('records')
+        'total_results': total,
+        'limit': limit,
+        'offset': offset,
+        'athletes': athletes
     })
 
 
 @app.route('/api/search/sport', methods=['GET'])
+@cached('olympics')
 def search_sport():
     sport = request.args.get('sport', type=str)
     if not sport:
         return jsonify({'error': 'Sport parameter required'}), 400
     
-    results = df[df['Sport'].str.contains(sport, case=False, na=False)]
+    # Match against the distinct sport names, then slice their rows from the index
+    sports = pd.Index(rows_by_sport.keys.astype(str))
+    matched = np.flatnonzero(sports.str.contains(sport, case=False, na=False))
+    positions = np.sort(np.concatenate([rows_by_sport.positions(sports[i]) for i in matched] or [rows_by_sport.order[:0]]))
+    results = df.iloc[positions]
     
     if results.empty:
         return jsonify({'message': 'No sports found', 'query': sport})
@@ -492,64 +575,155 @@ def search_sport():
         'total_athletes': int(results['ID'].nunique()),
         'total_events': int(results['Event'].nunique()),
         'years_active': sorted(results['Year'].unique().tolist()),
-        'top_countries': results['NOC'].value_counts().head(5).to_dict()
+        'top_countries': results['NOC'].value_counts().loc[lambda s: s > 0].head(5).to_dict()
     }
     
     return jsonify(stats)
 
+@app.route('/api/autocomplete', methods=['GET'])
+def autocomplete_vocabularies():
+    return jsonify({
+        'vocabularies': {name: len(vocab) for name, vocab in autocomplete.vocabularies.items()}
+    })
+
+
+@app.route('/api/autocomplete/<vocabulary>', methods=['GET'])
+@cached('olympics', 'netflix', 'ipl_deliveries')
+def autocomplete_suggestions(vocabulary):
+    query = request.args.get('q', default='', type=str)
+    limit = request.args.get('limit', default=autocomplete.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), autocomplete.MAX_LIMIT)
+
+    suggestions = autocomplete.suggest(vocabulary, query, limit)
+    if suggestions is None:
+        return jsonify({
+            'error': f"Unknown vocabulary '{vocabulary}'",
+            'available': list(autocomplete.vocabularies)
+        }), 404
+
+    return jsonify({
+        'vocabulary': vocabulary,
+        'query': query,
+        'suggestions': suggestions
+    })
+
 @app.route('/api/allBowlers-record')
+@cached('ipl_deliveries', 'ipl_matches', warm=True)
 def all_bowlers_api():
     return jsonify(ipl.allBowlers())
     
 
 @app.route('/api/allBatsmen-record')
+@cached('ipl_deliveries', 'ipl_matches', warm=True)
 def all_batsman_api():
     return jsonify(ipl.allBatsmen())
 
 
+def ipl_filters():
+    """Optional season / venue / opponent / phase filters of the IPL record endpoints"""
+    filters = {name: request.args.get(name) or None for name in ipl.FILTERS}
+    if filters['phase'] is not None and filters['phase'] not in ipl.PHASES:
+        return None
+    return filters
+
+
+def invalid_phase():
+    return jsonify({'error': f"phase must be one of: {', '.join(ipl.PHASES)}"}), 400
+
+
 @app.route('/api/team-record',methods=['GET'])
+@cached('ipl_deliveries', 'ipl_matches')
 def team_api():
     team_name = request.args.get('team')
-    result = ipl.teamAPI(team_name)
+    filters = ipl_filters()
+    if filters is None:
+        return invalid_phase()
+    result = ipl.teamAPI(team_name, **filters)
     return jsonify(result)
 
 
 @app.route('/api/bowler-record',methods=['GET'])
+@cached('ipl_deliveries', 'ipl_matches')
 def bowler_api():
     bowler_name = request.args.get('bowler')
-    result = ipl.bowlerAPI(bowler_name)
+    filters = ipl_filters()
+    if filters is None:
+        return invalid_phase()
+    result = ipl.bowlerAPI(bowler_name, **filters)
     return jsonify(result)
 
 @app.route('/api/batsman-record',methods=['GET'])
+@cached('ipl_deliveries', 'ipl_matches')
 def batsman_api():
     batsman_name = request.args.get('batsman')
-    result = ipl.batsmanAPI(batsman_name)
+    filters = ipl_filters()
+    if filters is None:
+        return invalid_phase()
+    result = ipl.batsmanAPI(batsman_name, **filters)
+    return jsonify(result)
+
+
+# ==========================================
+# ADMIN ENDPOINTS
+# ==========================================
+
+# Admin routes are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get('DARA_ADMIN_TOKEN', '')
+
+
+def is_admin():
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+@app.route('/api/admin/ipl/ingest', methods=['POST'])
+def ipl_ingest():
+    """Append a new IPL season uploaded as 'deliveries' and 'matches' CSV files"""
+    if not is_admin():
+        return jsonify({'error': 'Valid X-Admin-Token header required'}), 403
+
+    deliveries_file = request.files.get('deliveries')
+    matches_file = request.files.get('matches')
+    if deliveries_file is None or matches_file is None:
+        return jsonify({'error': "Upload both 'deliveries' and 'matches' CSV files"}), 400
+
+    persist = request.args.get('persist', '1') != '0'
+    try:
+        result = ipl.ingest_season(deliveries_file, matches_file, persist=persist)
+    except (ValueError, pd.errors.ParserError) as e:
+        return jsonify({'error': str(e)}), 400
+
     return jsonify(result)
 
 
 #-----------------------------Netflix Dataset APIS-------------------------------------
 
 @app.route('/api/movie-title')
+@cached('netflix')
 def movie_title():
     title = request.args.get("title")
     return jsonify(netflix.movie_by_titleAPI(title))
 
 @app.route('/api/tv-title')
+@cached('netflix')
 def tv_title():
     title = request.args.get("title")
     return jsonify(netflix.tvshow_by_titleAPI(title))
 
 @app.route('/api/movie-tv-distribution', methods=['GET'])
+@cached('netflix', warm=True)
 def movie_tv_distribution_api():
     result = netflix.movie_tv_distributionAPI()
     return jsonify(result)
 
 @app.route('/api/top-directors', methods=['GET'])
+@cached('netflix', warm=True)
 def top_directors_api():
     result = netflix.top_10_directorsAPI()
     return jsonify(result)
 
 @app.route('/api/country-stats', methods=['GET'])
+@cached('netflix', warm=True)
 def country_stats_api():
     result = netflix.country_statsAPI()
     
@@ -558,24 +732,114 @@ def country_stats_api():
     return jsonify(response)
 
 @app.route('/api/rating-distribution', methods=['GET'])
+@cached('netflix', warm=True)
 def rating_distribution_api():
     result = netflix.rating_distributionAPI()
     return jsonify(result)
 
+@app.route('/api/top-genres', methods=['GET'])
+@cached('netflix', warm=True)
+def top_genres_api():
+    limit = request.args.get('limit', default=netflix.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), netflix.MAX_LIMIT)
+    result = netflix.top_genresAPI(limit, request.args.get('type'))
+    return jsonify(result)
+
+@app.route('/api/top-actors', methods=['GET'])
+@cached('netflix', warm=True)
+def top_actors_api():
+    limit = request.args.get('limit', default=netflix.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), netflix.MAX_LIMIT)
+    result = netflix.top_actorsAPI(limit, request.args.get('type'))
+    return jsonify(result)
+
+@app.route('/api/genre-cooccurrence', methods=['GET'])
+@cached('netflix', warm=True)
+def genre_cooccurrence_api():
+    limit = request.args.get('limit', default=netflix.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), netflix.MAX_LIMIT)
+    result = netflix.genre_cooccurrenceAPI(request.args.get('genre'), limit)
+    return jsonify(result)
+
+@app.route('/api/catalog-additions', methods=['GET'])
+@cached('netflix', warm=True)
+def catalog_additions_api():
+    period = request.args.get('period', 'year')
+    return jsonify(netflix.catalog_additionsAPI(period))
+
+@app.route('/api/runtime-distribution', methods=['GET'])
+@cached('netflix', warm=True)
+def runtime_distribution_api():
+    return jsonify(netflix.runtime_distributionAPI())
+
+@app.route('/api/release-lag', methods=['GET'])
+@cached('netflix', warm=True)
+def release_lag_api():
+    return jsonify(netflix.release_lagAPI())
+
+@app.route('/api/netflix/titles', methods=['GET'])
+@cached('netflix')
+def browse_titles():
+    # Repeat a facet to accept several values: ?rating=TV-MA&rating=R
+    filters = {name: request.args.getlist(name) for name in netflix_browse.FACETS}
+    sort = request.args.get('sort', 'added')
+    if sort not in netflix_browse.SORTS:
+        return jsonify({'error': f"Unknown sort '{sort}'", 'valid': netflix_browse.SORTS}), 400
+    limit = request.args.get('limit', default=netflix_browse.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), netflix_browse.MAX_LIMIT)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+    year_from = request.args.get('year_from', type=int)
+    year_to = request.args.get('year_to', type=int)
+
+    result = netflix_browse.browse(filters, year_from, year_to, sort, limit, offset)
+    response = OrderedDict()
+    response['filters'] = dict(
+        {name: values for name, values in filters.items() if values},
+        year_from=year_from, year_to=year_to, sort=sort)
+    response['total_results'] = result['total_results']
+    response['limit'] = limit
+    response['offset'] = offset
+    response['titles'] = result['titles']
+    response['facets'] = result['facets']
+    return jsonify(response)
+
+@app.route('/api/similar-titles', methods=['GET'])
+@cached('netflix')
+def similar_titles_api():
+    title = request.args.get('title')
+    if not title:
+        return jsonify({"error": "Please provide ?title= parameter."})
+    limit = request.args.get('limit', default=recommender.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), recommender.MAX_NEIGHBORS)
+    return jsonify(recommender.similar_titlesAPI(title, limit, request.args.get('type')))
+
+@app.route('/api/country-genres', methods=['GET'])
+@cached('netflix')
+def country_genres_api():
+    country = request.args.get('country')
+    if not country:
+        return jsonify({"error": "Please provide ?country= parameter."})
+    limit = request.args.get('limit', default=netflix.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), netflix.MAX_LIMIT)
+    return jsonify(netflix.country_genresAPI(country, limit))
+
 #-----------------------------World Happiness Report Dataset APIs--------------------------------
 
 @app.route('/api/top-countries', methods=['GET'])
+@cached('happiness', warm=True)
 def top_happiness_countries():
     limit = int(request.args.get('limit', 10))
     result = happiness.top_countriesAPI(limit)
     return jsonify(result)
 
 @app.route('/api/factor-impact', methods=['GET'])
+@cached('happiness', warm=True)
 def factor_impact():
     result = happiness.factor_impactAPI()
     return jsonify(result)
 
 @app.route('/api/country-info', methods=['GET'])
+@cached('happiness')
 def country_info():
     name = request.args.get('name')
     if not name:
@@ -584,6 +848,7 @@ def country_info():
     return jsonify(result)
 
 @app.route('/api/compare-countries', methods=['GET'])
+@cached('happiness')
 def compare_countries():
     c1 = request.args.get('country1')
     c2 = request.args.get('country2')
@@ -592,19 +857,34 @@ def compare_countries():
     result = happiness.compare_countriesAPI(c1, c2)
     return jsonify(result)
 
+@app.route('/api/compare-countries/batch', methods=['GET'])
+@cached('happiness')
+def compare_countries_batch():
+    # ?countries=USA,India,Finland (or repeated ?countries=)
+    names = [name.strip() for value in request.args.getlist('countries') for name in value.split(',') if name.strip()]
+    if not names:
+        return jsonify({"error": "Please provide ?countries=country1,country2,... parameter."})
+    if len(names) > happiness.MAX_BATCH:
+        return jsonify({"error": f"At most {happiness.MAX_BATCH} countries per request."}), 400
+    result = happiness.compare_many_countriesAPI(names)
+    return jsonify(result)
+
 @app.route('/api/happiness-gap', methods=['GET'])
+@cached('happiness')
 def happiness_gap():
     region = request.args.get('region')
     result = happiness.happiness_gapAPI(region)
     return jsonify(result)
 
 @app.route('/api/country-rank-trend', methods=['GET'])
+@cached('happiness')
 def country_rank_trend():
     country = request.args.get('country')
     result = happiness.country_rank_trendAPI(country)
     return jsonify(result)  
 
 @app.route('/api/factor-averages', methods=['GET'])
+@cached('happiness', warm=True)
 def factor_averages():
     result = happiness.factor_averagesAPI()
     return jsonify(result)
@@ -612,31 +892,37 @@ def factor_averages():
 #-----------------------Global Energy Consumption dataset APIs----------------------------
 
 @app.route("/api/global-summary")
+@cached('energy', warm=True)
 def global_summary():
     return jsonify(energy.global_energy_summaryAPI())
 
 @app.route("/api/renewable-leaders")
+@cached('energy', warm=True)
 def renewable_leaders():
     limit = int(request.args.get("limit", 10))
     return jsonify(energy.renewable_leadersAPI(limit))
 
 @app.route("/api/cleanest-country")
+@cached('energy', warm=True)
 def cleanest():
     limit = int(request.args.get("limit", 10))
     return jsonify(energy.cleanest_countriesAPI(limit))
 
 @app.route("/api/compare-price")
+@cached('energy')
 def compare_price():
     c1 = request.args.get("country1")
     c2 = request.args.get("country2")
     return jsonify(energy.energy_price_comparisonAPI(c1, c2))
 
 @app.route("/api/energy-mix")
+@cached('energy')
 def energy_mix():
     country = request.args.get("country")
     return jsonify(energy.energy_mixAPI(country))
 
 @app.route("/api/factor-summary")
+@cached('energy', warm=True)
 def factor_summary():
     return jsonify(energy.factor_summaryAPI())
 
@@ -740,10 +1026,14 @@ def detailed_docs():
                     {
                         "path": "/api/search/athlete",
                         "method": "GET",
-                        "description": "Search for athletes by name",
-                        "parameters": [{"name": "name", "type": "string", "required": True, "description": "Athlete name or partial name"}],
-                        "example_url": "/api/search/athlete?name=Phelps",
-                        "sample_response": {"query": "Phelps", "total_results": 1, "athletes": [{"name": "Michael Phelps", "team": "USA", "total_medals": 28}]}
+                        "description": "Search for athletes by name (case- and accent-insensitive, prefix or substring, ranked)",
+                        "parameters": [
+                            {"name": "name", "type": "string", "required": True, "description": "Athlete name or partial name"},
+                            {"name": "limit", "type": "integer", "required": False, "description": "Results per page (default 50, max 200)"},
+                            {"name": "offset", "type": "integer", "required": False, "description": "Number of results to skip"}
+                        ],
+                        "example_url": "/api/search/athlete?name=Phelps&limit=10",
+                        "sample_response": {"query": "Phelps", "total_results": 1, "limit": 10, "offset": 0, "athletes": [{"ID": 94406, "Name": "Michael Fred Phelps, II", "Team": "United States", "Sex": "M", "Years": [2000, 2004, 2008, 2012, 2016], "Total_Medals": 28, "Sports": ["Swimming"]}]}
                     }
                 ]
             },
@@ -754,18 +1044,18 @@ def detailed_docs():
                     {
                         "path": "/api/movie-title",
                         "method": "GET",
-                        "description": "Get movie details by title",
-                        "parameters": [{"name": "title", "type": "string", "required": True, "description": "Exact movie title"}],
+                        "description": "Get movie details by title (case- and accent-insensitive; falls back to the closest title, flagged by exact_match)",
+                        "parameters": [{"name": "title", "type": "string", "required": True, "description": "Movie title"}],
                         "example_url": "/api/movie-title?title=Inception",
-                        "sample_response": {"title": "Inception", "main_director": "Christopher Nolan", "cast": "Leonardo DiCaprio, Marion Cotillard", "release_year": 2010, "rating": "PG-13"}
+                        "sample_response": {"title": "Inception", "exact_match": True, "main_director": "Christopher Nolan", "cast": "Leonardo DiCaprio, Marion Cotillard", "release_year": 2010, "rating": "PG-13"}
                     },
                     {
                         "path": "/api/tv-title",
                         "method": "GET",
-                        "description": "Get TV show details by title",
-                        "parameters": [{"name": "title", "type": "string", "required": True, "description": "Exact TV show title"}],
+                        "description": "Get TV show details by title (case- and accent-insensitive; falls back to the closest title, flagged by exact_match)",
+                        "parameters": [{"name": "title", "type": "string", "required": True, "description": "TV show title"}],
                         "example_url": "/api/tv-title?title=Breaking%20Bad",
-                        "sample_response": {"title": "Breaking Bad", "main_director": "Vince Gilligan", "cast": "Bryan Cranston, Aaron Paul"}
+                        "sample_response": {"title": "Breaking Bad", "exact_match": True, "main_director": "Vince Gilligan", "cast": "Bryan Cranston, Aaron Paul"}
                     },
                     {
                         "path": "/api/movie-tv-distribution",
@@ -786,10 +1076,10 @@ def detailed_docs():
                     {
                         "path": "/api/country-stats",
                         "method": "GET",
-                        "description": "Get content distribution by country",
+                        "description": "Get content distribution by country (co-productions count for every listed country)",
                         "parameters": [],
                         "example_url": "/api/country-stats",
-                        "sample_response": {"data": [{"country": "United States", "title_count": 3000}, {"country": "India", "title_count": 1200}]}
+                        "sample_response": {"data": [{"country": "United States", "title_count": 4518}, {"country": "India", "title_count": 1046}]}
                     },
                     {
                         "path": "/api/rating-distribution",
@@ -798,6 +1088,104 @@ def detailed_docs():
                         "parameters": [],
                         "example_url": "/api/rating-distribution",
                         "sample_response": {"data": [{"rating": "TV-MA", "count": 2500, "percentage": 25.0}]}
+                    },
+                    {
+                        "path": "/api/top-genres",
+                        "method": "GET",
+                        "description": "Get genres by number of titles",
+                        "parameters": [
+                            {"name": "limit", "type": "integer", "required": False, "default": 10, "description": "Number of genres to return"},
+                            {"name": "type", "type": "string", "required": False, "description": "Movie or TV Show"}
+                        ],
+                        "example_url": "/api/top-genres?type=Movie&limit=5",
+                        "sample_response": [{"genre": "International Movies", "title_count": 2752}, {"genre": "Dramas", "title_count": 2427}]
+                    },
+                    {
+                        "path": "/api/top-actors",
+                        "method": "GET",
+                        "description": "Get cast members by number of titles",
+                        "parameters": [
+                            {"name": "limit", "type": "integer", "required": False, "default": 10, "description": "Number of actors to return"},
+                            {"name": "type", "type": "string", "required": False, "description": "Movie or TV Show"}
+                        ],
+                        "example_url": "/api/top-actors?limit=5",
+                        "sample_response": [{"actor": "Anupam Kher", "title_count": 43}, {"actor": "Shah Rukh Khan", "title_count": 35}]
+                    },
+                    {
+                        "path": "/api/genre-cooccurrence",
+                        "method": "GET",
+                        "description": "Get genres listed alongside a genre, or the most common genre pairs when no genre is given",
+                        "parameters": [
+                            {"name": "genre", "type": "string", "required": False, "description": "Genre name (case-insensitive)"},
+                            {"name": "limit", "type": "integer", "required": False, "default": 10, "description": "Number of genres or pairs to return"}
+                        ],
+                        "example_url": "/api/genre-cooccurrence?genre=Dramas&limit=3",
+                        "sample_response": {"genre": "Dramas", "title_count": 2427, "cooccurring": [{"genre": "International Movies", "title_count": 1483}]}
+                    },
+                    {
+                        "path": "/api/country-genres",
+                        "method": "GET",
+                        "description": "Get the genre mix of a country's titles",
+                        "parameters": [
+                            {"name": "country", "type": "string", "required": True, "description": "Country name (case-insensitive)"},
+                            {"name": "limit", "type": "integer", "required": False, "default": 10, "description": "Number of genres to return"}
+                        ],
+                        "example_url": "/api/country-genres?country=India&limit=3",
+                        "sample_response": {"country": "India", "title_count": 1046, "genres": [{"genre": "International Movies", "title_count": 864, "percentage": 82.6}]}
+                    },
+                    {
+                        "path": "/api/catalog-additions",
+                        "method": "GET",
+                        "description": "Get titles added to Netflix per year or month, by type, with a running total",
+                        "parameters": [{"name": "period", "type": "string", "required": False, "default": "year", "description": "year or month"}],
+                        "example_url": "/api/catalog-additions?period=month",
+                        "sample_response": {"period": "year", "data": [{"year": 2021, "movie": 993, "tv_show": 505, "total": 1498, "cumulative": 8804}]}
+                    },
+                    {
+                        "path": "/api/runtime-distribution",
+                        "method": "GET",
+                        "description": "Get movie runtime histogram (15-minute buckets) and TV show season counts",
+                        "parameters": [],
+                        "example_url": "/api/runtime-distribution",
+                        "sample_response": {"movies": {"count": 6128, "mean_minutes": 99.6, "median_minutes": 98.0, "histogram": [{"bucket": "90-104 min", "count": 1932}]}, "tv_shows": {"count": 2676, "mean_seasons": 1.76, "histogram": [{"seasons": 1, "count": 1793}]}}
+                    },
+                    {
+                        "path": "/api/release-lag",
+                        "method": "GET",
+                        "description": "Get years between release and arrival on Netflix, overall, by type and by year added",
+                        "parameters": [],
+                        "example_url": "/api/release-lag",
+                        "sample_response": {"median_lag_years": 1.0, "by_type": [{"type": "Movie", "median_lag_years": 2.0, "mean_lag_years": 5.73}], "histogram": [{"lag": "same year or earlier", "count": 3254}], "by_added_year": [{"year": 2021, "median_lag_years": 1.0, "mean_lag_years": 5.75}]}
+                    },
+                    {
+                        "path": "/api/netflix/titles",
+                        "method": "GET",
+                        "description": "Browse titles by facets with pagination; facet counts reflect the current filters. Repeat a facet parameter to match any of several values",
+                        "parameters": [
+                            {"name": "type", "type": "string", "required": False, "description": "Movie or TV Show"},
+                            {"name": "rating", "type": "string", "required": False, "description": "Rating, e.g. TV-MA"},
+                            {"name": "country", "type": "string", "required": False, "description": "Any listed production country"},
+                            {"name": "genre", "type": "string", "required": False, "description": "Genre, e.g. Dramas"},
+                            {"name": "year_from", "type": "integer", "required": False, "description": "Earliest release year (inclusive)"},
+                            {"name": "year_to", "type": "integer", "required": False, "description": "Latest release year (inclusive)"},
+                            {"name": "sort", "type": "string", "required": False, "default": "added", "description": "added, release_year or title"},
+                            {"name": "limit", "type": "integer", "required": False, "description": "Results per page (default 20, max 100)"},
+                            {"name": "offset", "type": "integer", "required": False, "default": 0, "description": "Results to skip"}
+                        ],
+                        "example_url": "/api/netflix/titles?type=Movie&country=India&genre=Dramas&year_from=2015&limit=10",
+                        "sample_response": {"total_results": 96, "limit": 10, "offset": 0, "titles": [{"show_id": 893, "title": "Tottaa Pataaka Item Maal", "type": "Movie", "rating": "TV-MA", "release_year": 2018, "date_added": "2021-05-13", "duration": "107 min", "country": "India", "genres": ["Dramas", "Independent Movies", "International Movies"]}], "facets": {"rating": [{"value": "TV-MA", "count": 96}]}}
+                    },
+                    {
+                        "path": "/api/similar-titles",
+                        "method": "GET",
+                        "description": "Get the titles most similar to a title by description, genres, cast and director",
+                        "parameters": [
+                            {"name": "title", "type": "string", "required": True, "description": "Movie or TV show title (closest match if not exact)"},
+                            {"name": "limit", "type": "integer", "required": False, "default": 10, "description": "Number of similar titles (max 20)"},
+                            {"name": "type", "type": "string", "required": False, "description": "Movie or TV Show, to disambiguate the title"}
+                        ],
+                        "example_url": "/api/similar-titles?title=Stranger%20Things&limit=3",
+                        "sample_response": {"title": "Stranger Things", "type": "TV Show", "exact_match": True, "similar": [{"title": "Beyond Stranger Things", "type": "TV Show", "release_year": 2017, "genres": ["Stand-Up Comedy & Talk Shows", "TV Mysteries", "TV Sci-Fi & Fantasy"], "similarity": 0.411}]}
                     }
                 ]
             },
@@ -837,6 +1225,14 @@ def detailed_docs():
                         "example_url": "/api/compare-countries?country1=India&country2=Finland",
                         "sample_response": {"summary": {"more_happy_country": "Finland", "score_difference": 2.2}}
                     },
+                    {
+                        "path": "/api/compare-countries/batch",
+                        "method": "GET",
+                        "description": "Compare any number of countries on score, rank and every factor in one request (names are case-insensitive and accept aliases such as USA or UK)",
+                        "parameters": [{"name": "countries", "type": "string", "required": True, "description": "Comma-separated country names (max 50)"}],
+                        "example_url": "/api/compare-countries/batch?countries=USA,India,Finland",
+                        "sample_response": {"summary": {"happiest_country": "Finland", "least_happy_country": "India", "score_range": 2.841, "factor_leaders": {"Economy (GDP per Capita)": "United States"}}, "data": [{"country": "United States", "region": "North America", "happiness_rank": 15, "happiness_score": 7.119, "factors": {"Economy (GDP per Capita)": 1.395}}], "not_found": []}
+                    },
                     {
                         "path": "/api/factor-averages",
                         "method": "GET",
@@ -924,29 +1320,59 @@ def detailed_docs():
                     {
                         "path": "/api/team-record",
                         "method": "GET",
-                        "description": "Get team statistics",
-                        "parameters": [{"name": "team", "type": "string", "required": True, "description": "Team name"}],
+                        "description": "Get team statistics: results, run rate over legal deliveries, head-to-head by opponent and per-season splits",
+                        "parameters": [
+                            {"name": "team", "type": "string", "required": True, "description": "Team name"},
+                            {"name": "season", "type": "string", "required": False, "description": "Season label, e.g. 2019 or 2020/21"},
+                            {"name": "venue", "type": "string", "required": False, "description": "Venue name"},
+                            {"name": "opponent", "type": "string", "required": False, "description": "Opposing team"},
+                            {"name": "phase", "type": "string", "required": False, "description": "powerplay (overs 1-6), middle (7-15) or death (16-20)"}
+                        ],
                         "example_url": "/api/team-record?team=Mumbai%20Indians",
-                        "sample_response": {"team": "Mumbai Indians", "wins": 80, "losses": 45, "win_percentage": 64.0}
+                        "sample_response": {"team": "Mumbai Indians", "filters": {}, "total_matches": 231, "wins": 131, "losses": 100, "ties": 4, "no_result": 0, "runs": 36462, "run_rate": 8.27, "vs_team": [{"opponent": "Chennai Super Kings", "matches": 34, "wins": 20, "losses": 14, "ties": 0, "no_result": 0}], "seasons": [{"season": "2020/21", "matches": 16, "wins": 11, "losses": 5, "ties": 0, "no_result": 0, "runs": 2686, "run_rate": 9.1}]}
                     },
                     {
                         "path": "/api/batsman-record",
                         "method": "GET",
                         "description": "Get specific batsman statistics",
-                        "parameters": [{"name": "batsman", "type": "string", "required": True, "description": "Batsman name"}],
-                        "example_url": "/api/batsman-record?batsman=Virat%20Kohli",
+                        "parameters": [
+                            {"name": "batsman", "type": "string", "required": True, "description": "Batsman name"},
+                            {"name": "season", "type": "string", "required": False, "description": "Season label, e.g. 2019 or 2020/21"},
+                            {"name": "venue", "type": "string", "required": False, "description": "Venue name"},
+                            {"name": "opponent", "type": "string", "required": False, "description": "Opposing team"},
+                            {"name": "phase", "type": "string", "required": False, "description": "powerplay (overs 1-6), middle (7-15) or death (16-20)"}
+                        ],
+                        "example_url": "/api/batsman-record?batsman=V%20Kohli&season=2016&phase=death",
                         "sample_response": {"name": "Virat Kohli", "runs": 6000, "matches": 150, "centuries": 46, "average": 45.5}
                     },
                     {
                         "path": "/api/bowler-record",
                         "method": "GET",
                         "description": "Get specific bowler statistics",
-                        "parameters": [{"name": "bowler", "type": "string", "required": True, "description": "Bowler name"}],
+                        "parameters": [
+                            {"name": "bowler", "type": "string", "required": True, "description": "Bowler name"},
+                            {"name": "season", "type": "string", "required": False, "description": "Season label, e.g. 2019 or 2020/21"},
+                            {"name": "venue", "type": "string", "required": False, "description": "Venue name"},
+                            {"name": "opponent", "type": "string", "required": False, "description": "Opposing team"},
+                            {"name": "phase", "type": "string", "required": False, "description": "powerplay (overs 1-6), middle (7-15) or death (16-20)"}
+                        ],
                         "example_url": "/api/bowler-record?bowler=Jasprit%20Bumrah",
                         "sample_response": {"name": "Jasprit Bumrah", "wickets": 120, "matches": 100, "economy": 7.2, "average": 25.3}
                     }
                 ]
             }
+        },
+        "autocomplete": {
+            "path": "/api/autocomplete/<vocabulary>",
+            "method": "GET",
+            "description": "Type-ahead suggestions for exact names to pass to other endpoints, most frequent first",
+            "vocabularies": ["sports", "nocs", "titles", "batters", "bowlers"],
+            "parameters": [
+                {"name": "q", "type": "string", "required": False, "description": "Prefix of the name or of any word in it"},
+                {"name": "limit", "type": "integer", "required": False, "description": "Max suggestions (default 10, max 50)"}
+            ],
+            "example_url": "/api/autocomplete/batters?q=koh&limit=5",
+            "sample_response": {"vocabulary": "batters", "query": "koh", "suggestions": [{"value": "V Kohli", "count": 4319}]}
         }
     }
     return jsonify(docs)
@@ -973,9 +1399,15 @@ def internal_error(error):
 
 
 # ==========================================
-# RUN SERVER
+# WARM-UP
 # ==========================================
 
+# Precompute every cached endpoint before accepting traffic (DARA_WARMUP=1).
+# With `gunicorn --preload` this happens once in the master before forking.
+if os.environ.get('DARA_WARMUP', '0') == '1':
+    warmup.warm_up(app)
+
+
 # ==========================================
 # RUN SERVER
 # ==========================================
@@ -0,0 +1,165 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import datasets
+from text_index import fold, tokenize, prefix_range
+
+# In-memory athlete name search: built once at import, read-only afterwards.
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+MIN_SUBSTRING = 3  # shorter queries only match from the start of a word
+
+# Match ranks (lower is better)
+EXACT, NAME_PREFIX, WORD_PREFIX, SUBSTRING, NO_MATCH = range(5)
+
+SUMMARY_KEYS = ['ID', 'Name', 'Team', 'Sex']
+
+df = datasets.olympics()
+if df.empty:
+    df = pd.DataFrame(columns=SUMMARY_KEYS + ['Year', 'Sport', 'Medal'])
+
+
+def _offsets(group_codes, n_groups):
+    """CSR offsets for rows already sorted by group code"""
+    return np.concatenate(([0], np.cumsum(np.bincount(group_codes, minlength=n_groups))))
+
+
+# ==========================================
+# PER-ATHLETE SUMMARIES
+# ==========================================
+
+# One row per (ID, Name, Team, Sex), in groupby order
+_grouped = df.groupby(SUMMARY_KEYS, observed=True)
+summary = _grouped.size().index.to_frame(index=False)
+_codes = _grouped.ngroup().to_numpy()
+_n_athletes = len(summary)
+
+_medal_counts = np.bincount(_codes, weights=df['Medal'].notna().to_numpy(), minlength=_n_athletes).astype(int)
+
+# Distinct years per athlete, ascending (CSR: values + offsets)
+_years = pd.DataFrame({'g': _codes, 'v': df['Year'].to_numpy()}).drop_duplicates().sort_values(['g', 'v'])
+_year_values = _years['v'].to_numpy()
+_year_offsets = _offsets(_years['g'].to_numpy(), _n_athletes)
+
+# Distinct sports per athlete, in order of first appearance
+_sport_codes, _sport_names = pd.factorize(df['Sport'])
+_sports = pd.DataFrame({'g': _codes, 'v': _sport_codes}).drop_duplicates().sort_values('g', kind='stable')
+_sport_values = _sports['v'].to_numpy()
+_sport_offsets = _offsets(_sports['g'].to_numpy(), _n_athletes)
+_sport_names = np.asarray(_sport_names, dtype=object)
+
+
+def athlete_record(i):
+    """Summary of athlete row ``i``: years, medal count and sports"""
+    row = summary.iloc[i]
+    years = _year_values[_year_offsets[i]:_year_offsets[i + 1]]
+    sports = _sport_values[_sport_offsets[i]:_sport_offsets[i + 1]]
+    return {
+        'ID': int(row['ID']),
+        'Name': row['Name'],
+        'Team': row['Team'],
+        'Sex': row['Sex'],
+        'Years': [int(y) for y in years],
+        'Total_Medals': int(_medal_counts[i]),
+        'Sports': _sport_names[sports].tolist()
+    }
+
+
+# ==========================================
+# NAME INDEX
+# ==========================================
+
+# Unique names; each maps to a contiguous run of summary rows (summary is sorted by ID, not name)
+_name_codes, _names = pd.factorize(summary['Name'])
+_name_rows = np.argsort(_name_codes, kind='stable')
+_name_offsets = _offsets(_name_codes[_name_rows], len(_names))
+_name_medals = np.bincount(_name_codes, weights=_medal_counts, minlength=len(_names))
+
+_folded = [fold(name) for name in _names]
+
+# Sorted folded names (exact / whole-name prefix) and each name's alphabetical rank
+_name_order = np.argsort(np.array(_folded, dtype=str), kind='stable')
+_sorted_names = np.array(_folded, dtype=str)[_name_order]
+_alpha_rank = np.empty(len(_names), dtype=np.int64)
+_alpha_rank[_name_order] = np.arange(len(_names))
+
+# Sorted (token, name) pairs for word-prefix matching
+_token_list, _token_owner = [], []
+for _i, _name in enumerate(_folded):
+    for _token in set(tokenize(_name)):
+        _token_list.append(_token)
+        _token_owner.append(_i)
+_token_order = np.argsort(np.array(_token_list, dtype=str), kind='stable')
+_sorted_tokens = np.array(_token_list, dtype=str)[_token_order]
+_token_names = np.array(_token_owner, dtype=np.int64)[_token_order]
+
+# All folded names joined into one string for substring scans
+_corpus = '\n'.join(_folded)
+_corpus_starts = np.cumsum([0] + [len(name) + 1 for name in _folded[:-1]]) if _folded else np.zeros(0, dtype=np.int64)
+
+
+def _rank_names(query):
+    """Best match rank of every unique name for a folded query"""
+    ranks = np.full(len(_names), NO_MATCH, dtype=np.int8)
+
+    # Substring anywhere in the name
+    if len(query) >= MIN_SUBSTRING:
+        hits = [m.start() for m in re.finditer(re.escape(query), _corpus)]
+        if hits:
+            ranks[np.searchsorted(_corpus_starts, hits, side='right') - 1] = SUBSTRING
+
+    # Every query word starts a word of the name ("phel mich" -> "Michael Phelps")
+    words = tokenize(query)
+    if words:
+        matched = np.ones(len(_names), dtype=bool)
+        for word in words:
+            lo, hi = prefix_range(_sorted_tokens, word)
+            has_word = np.zeros(len(_names), dtype=bool)
+            has_word[_token_names[lo:hi]] = True
+            matched &= has_word
+        ranks[matched] = np.minimum(ranks[matched], WORD_PREFIX)
+
+    # Whole-name prefix and exact match
+    lo, hi = prefix_range(_sorted_names, query)
+    ranks[_name_order[lo:hi]] = NAME_PREFIX
+    lo = int(np.searchsorted(_sorted_names, query, side='left'))
+    hi = int(np.searchsorted(_sorted_names, query, side='right'))
+    ranks[_name_order[lo:hi]] = EXACT
+
+    return ranks
+
+
+def search(query, limit=DEFAULT_LIMIT, offset=0):
+    """Search athletes by name; returns ``(total_results, page_of_records)``.
+
+    Case- and accent-insensitive. Results are ranked exact name, name prefix,
+    word prefix, then substring; ties go to more medals, then alphabetical.
+    """
+    query = fold(query)
+    if not query:
+        return 0, []
+
+    ranks = _rank_names(query)
+    matched = np.flatnonzero(ranks < NO_MATCH)
+    matched = matched[np.lexsort((_alpha_rank[matched], -_name_medals[matched], ranks[matched]))]
+
+    counts = _name_offsets[matched + 1] - _name_offsets[matched]
+    total = int(counts.sum())
+
+    # Expand only the names that land on the requested page
+    page = []
+    ends = np.cumsum(counts)
+    k = int(np.searchsorted(ends, offset, side='right'))
+    skip = offset - (int(ends[k - 1]) if k > 0 else 0)
+    while k < len(matched) and len(page) < limit:
+        name_id = matched[k]
+        rows = _name_rows[_name_offsets[name_id]:_name_offsets[name_id + 1]]
+        for i in rows[skip:skip + limit - len(page)]:
+            page.append(athlete_record(i))
+        skip = 0
+        k += 1
+
+    return total, page
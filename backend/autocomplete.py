@@ -0,0 +1,115 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import datasets
+import netflix
+import ipl
+from text_index import fold, prefix_range
+
+# Type-ahead suggestions over fixed vocabularies (sports, NOCs, titles, players).
+# Each vocabulary keeps its keys in one sorted array, so a prefix is a binary-search
+# range - the same lookups a trie gives, without a node per character.
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_WORD_START = re.compile(r'(?<=\W)\w')
+
+
+class Vocabulary:
+    """Prefix lookup over a set of values, ranked by how often each value occurs"""
+
+    def __init__(self, counts):
+        counts = counts[counts > 0]
+        self.values = np.asarray(counts.index.astype(str), dtype=object)
+        self.counts = counts.to_numpy(dtype=np.int64)
+
+        # Each value is reachable from its start (kind 0) and from every later word (kind 1),
+        # so "dhoni" finds "MS Dhoni"
+        keys, owners, kinds = [], [], []
+        folded = [fold(value) for value in self.values]
+        for i, text in enumerate(folded):
+            keys.append(text)
+            owners.append(i)
+            kinds.append(0)
+            for match in _WORD_START.finditer(text):
+                keys.append(text[match.start():])
+                owners.append(i)
+                kinds.append(1)
+
+        keys = np.array(keys, dtype=str)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.owners = np.array(owners, dtype=np.int64)[order]
+        self.kinds = np.array(kinds, dtype=np.int8)[order]
+
+        self.alpha = np.empty(len(folded), dtype=np.int64)
+        self.alpha[np.argsort(np.array(folded, dtype=str), kind='stable')] = np.arange(len(folded))
+
+    def __len__(self):
+        return len(self.values)
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        """Top ``limit`` values matching ``prefix``: value prefixes first, then by count"""
+        prefix = fold(prefix)
+        if prefix:
+            lo, hi = prefix_range(self.keys, prefix)
+            owners, kinds = self.owners[lo:hi], self.kinds[lo:hi]
+            # Keep each value once, with its best match kind
+            order = np.lexsort((kinds, owners))
+            ids, first = np.unique(owners[order], return_index=True)
+            kinds = kinds[order][first]
+        else:
+            ids = np.arange(len(self.values))
+            kinds = np.zeros(len(ids), dtype=np.int8)
+
+        top = np.lexsort((self.alpha[ids], -self.counts[ids], kinds))[:limit]
+        return [
+            {'value': self.values[i], 'count': int(self.counts[i])}
+            for i in ids[top]
+        ]
+
+
+def _counts(frame, column):
+    if column not in frame.columns:
+        return pd.Series(dtype='int64')
+    return frame[column].value_counts()
+
+
+# ==========================================
+# VOCABULARIES
+# ==========================================
+
+def _vocabularies():
+    olympics = datasets.olympics()
+    return {
+        'sports': Vocabulary(_counts(olympics, 'Sport')),           # athlete entries per sport
+        'nocs': Vocabulary(_counts(olympics, 'NOC')),               # athlete entries per NOC
+        'titles': Vocabulary(_counts(netflix.df, 'title')),         # Netflix titles
+        'batters': Vocabulary(ipl.batting_cube.totals('balls')),          # balls faced
+        'bowlers': Vocabulary(ipl.bowling_cube.totals('balls_bowled')),   # balls bowled
+    }
+
+
+# Built once and snapshotted with the datasets
+vocabularies = datasets.derived('vocabularies', _vocabularies, 'olympics', 'netflix', 'ipl_aggregates')
+
+
+def _refresh(name):
+    # Player vocabularies follow IPL ingests (the cubes already include new seasons)
+    if name == 'ipl_deliveries':
+        vocabularies['batters'] = Vocabulary(ipl.batting_cube.totals('balls'))
+        vocabularies['bowlers'] = Vocabulary(ipl.bowling_cube.totals('balls_bowled'))
+
+
+datasets.on_change(_refresh)
+
+
+def suggest(vocabulary, prefix, limit=DEFAULT_LIMIT):
+    """Suggestions from a named vocabulary, or None if it doesn't exist"""
+    vocab = vocabularies.get(vocabulary)
+    if vocab is None:
+        return None
+    return vocab.suggest(prefix, limit)
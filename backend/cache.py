@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+import os
+import threading
+import time
+
+import datasets
+
+# Rendered JSON responses of read-only endpoints, keyed by route + query args.
+MAX_ENTRIES = int(os.environ.get('DARA_CACHE_SIZE', 512))
+TTL_SECONDS = float(os.environ.get('DARA_CACHE_TTL', 0))  # 0 = never expire
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with optional TTL and per-dataset invalidation"""
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, dataset names, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value, dataset_names=()):
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (expires_at, frozenset(dataset_names), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, dataset_name=None):
+        """Drop entries built from ``dataset_name`` (or everything when None)"""
+        with self._lock:
+            if dataset_name is None:
+                self._entries.clear()
+                return
+            stale = [key for key, entry in self._entries.items() if dataset_name in entry[1]]
+            for key in stale:
+                del self._entries[key]
+
+    def reset_stats(self):
+        """Zero the hit/miss/eviction counters (entries are kept)"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl or None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0
+            }
+
+
+responses = ResponseCache()
+datasets.on_change(responses.invalidate)
+
+
+def _request_key():
+    # Normalize query args so ?a=1&b=2 and ?b=2&a=1 share an entry
+    args = tuple(sorted(request.args.items(multi=True)))
+    return (request.path, args)
+
+
+def cached(*dataset_names, warm=False):
+    """Cache a GET route's successful JSON response until its datasets change.
+
+    ``warm=True`` marks routes that need no query args, so the warm-up pass
+    can render them before the first request.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = _request_key()
+            body = responses.get(key)
+            if body is not None:
+                return current_app.response_class(body, mimetype='application/json')
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                responses.set(key, response.get_data(), dataset_names)
+            return response
+        wrapper.cached_datasets = dataset_names
+        wrapper.warm = warm
+        return wrapper
+    return decorator
@@ -0,0 +1,282 @@
+import pandas as pd
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional; snapshots fall back to pickle
+    feather = None
+
+# Central registry so every module shares a single copy of each dataset.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, '..', 'data'))
+
+# Cleaned frames are persisted here and reused until the source CSV changes.
+SNAPSHOT_DIR = os.environ.get('DARA_SNAPSHOT_DIR', os.path.join(BASE_DIR, '.snapshots'))
+USE_SNAPSHOTS = os.environ.get('DARA_SNAPSHOTS', '1') != '0'
+# Snapshots are keyed on the cleaner's module source; bump to force a rebuild anyway
+SNAPSHOT_VERSION = 1
+
+_frames = {}
+_stats = {}
+_sources = {}
+_keys = {}
+_chunks = {}
+_listeners = []
+_lock = threading.RLock()
+
+
+def _resolve(path):
+    if os.path.exists(path):
+        return path
+    # Fallback: try the current directory
+    if os.path.exists(os.path.basename(path)):
+        return os.path.basename(path)
+    return None
+
+
+def _source_hash(clean):
+    # The whole module, so edits to constants, helpers and globals the cleaner uses
+    # also invalidate its snapshots
+    try:
+        with open(inspect.getsourcefile(clean), 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except (TypeError, OSError):
+        return hashlib.sha1(clean.__code__.co_code).hexdigest()
+
+
+def _snapshot_key(source, clean):
+    st = os.stat(source)
+    parts = [os.path.abspath(source), str(st.st_size), str(st.st_mtime_ns), str(SNAPSHOT_VERSION)]
+    if clean is not None:
+        parts.append(f"{clean.__module__}.{clean.__qualname__}")
+        parts.append(_source_hash(clean))
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def _snapshot_paths(name, key):
+    base = os.path.join(SNAPSHOT_DIR, f"{name}-{key}")
+    return base + '.feather', base + '.pkl'
+
+
+def _read_snapshot(name, key):
+    feather_path, pickle_path = _snapshot_paths(name, key)
+    try:
+        if feather is not None and os.path.exists(feather_path):
+            # to_pandas() copies every column into pandas-owned memory, so the frame is
+            # never backed by the file; memory-mapping the read would only add page cache.
+            # The win over CSV is skipping parsing and cleaning, not the copy.
+            return feather.read_table(feather_path).to_pandas()
+        if os.path.exists(pickle_path):
+            return pd.read_pickle(pickle_path)
+    except Exception:
+        pass  # Corrupt or incompatible snapshot: rebuild from CSV
+    return None
+
+
+def _write_snapshot(name, key, frame):
+    feather_path, pickle_path = _snapshot_paths(name, key)
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # Drop stale snapshots of this dataset
+        for fname in os.listdir(SNAPSHOT_DIR):
+            if fname.startswith(f"{name}-") and not fname.endswith('.tmp'):
+                os.remove(os.path.join(SNAPSHOT_DIR, fname))
+
+        # Write to a temp file first so concurrent workers never read a partial file
+        tmp_path = f"{feather_path}.{os.getpid()}.tmp"
+        try:
+            if feather is None:
+                raise ValueError('pyarrow not installed')
+            frame.to_feather(tmp_path, compression='uncompressed')
+            os.replace(tmp_path, feather_path)
+        except Exception:
+            frame.to_pickle(tmp_path)
+            os.replace(tmp_path, pickle_path)
+    except OSError:
+        pass  # Read-only filesystem: keep serving from CSV
+
+
+def load(name, path, clean=None):
+    """Load a dataset once and hand the same DataFrame to every caller.
+
+    ``clean`` takes the raw frame and returns the cleaned one; its output is
+    snapshotted so later boots skip both CSV parsing and cleaning.
+    """
+    with _lock:
+        if name in _frames:
+            return _frames[name]
+
+        start = time.perf_counter()
+        source = _resolve(path)
+        frame, origin = None, 'csv'
+
+        if source is None:
+            frame, origin = pd.DataFrame(), 'missing'
+        elif USE_SNAPSHOTS:
+            key = _keys[name] = _snapshot_key(source, clean)
+            frame = _read_snapshot(name, key)
+            if frame is not None:
+                origin = 'snapshot'
+
+        if frame is None:
+            frame = pd.read_csv(source)
+            if clean is not None:
+                frame = clean(frame)
+            if USE_SNAPSHOTS:
+                _write_snapshot(name, key, frame)
+
+        elapsed = time.perf_counter() - start
+        _frames[name] = frame
+        _sources[name] = source
+        _stats[name] = {
+            'source': os.path.basename(path),
+            'loaded_from': origin,
+            'rows': int(len(frame)),
+            'columns': int(len(frame.columns)),
+            'load_seconds': round(elapsed, 3),
+        }
+        return frame
+
+
+def derived(name, build, *sources):
+    """``build()``, snapshotted like a cleaned frame so later boots skip rebuilding it.
+
+    For indexes and aggregates computed from loaded datasets: the snapshot is keyed on
+    the ``sources`` (names of datasets or of other derived values) and on the source of
+    ``build``'s module, so it is rebuilt when either changes. ``build`` must return
+    something picklable.
+    """
+    keys = [_keys.get(source) for source in sources]
+    if not USE_SNAPSHOTS or None in keys:
+        return build()
+
+    key = _keys[name] = hashlib.sha1('|'.join(keys + [name, _source_hash(build), str(SNAPSHOT_VERSION)]).encode()).hexdigest()[:16]
+    path = os.path.join(SNAPSHOT_DIR, f"{name}-{key}.pkl")
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # Corrupt or incompatible snapshot: rebuild
+
+    value = build()
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        for fname in os.listdir(SNAPSHOT_DIR):
+            if fname.startswith(f"{name}-") and not fname.endswith('.tmp'):
+                os.remove(os.path.join(SNAPSHOT_DIR, fname))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Read-only filesystem: keep the built value
+    return value
+
+
+# Compact schema for the Olympics frame: low-cardinality strings become
+# categoricals, numbers get the smallest dtype that holds them.
+OLYMPIC_CATEGORIES = ['Sex', 'Team', 'NOC', 'Games', 'Season', 'City', 'Sport', 'Event', 'Medal']
+OLYMPIC_NUMERIC = {
+    'ID': 'int32',
+    'Year': 'int16',
+    'Age': 'UInt8',      # nullable: age is unknown for some athletes
+    'Height': 'float32',
+    'Weight': 'float32',
+}
+
+
+def type_olympics(frame):
+    """Apply the compact Olympics schema"""
+    for col in OLYMPIC_CATEGORIES:
+        if col in frame.columns:
+            frame[col] = frame[col].astype('category')
+    for col, dtype in OLYMPIC_NUMERIC.items():
+        if col in frame.columns:
+            frame[col] = frame[col].astype(dtype)
+    return frame
+
+
+def olympics():
+    """Olympic athlete events (shared by app.py and both olympic modules)"""
+    return load('olympics', os.path.join(BASE_DIR, 'athlete_events.csv'), clean=type_olympics)
+
+
+# Compact schema for IPL ball-by-ball rows: player/team names become
+# categoricals, per-ball counters fit in int8.
+IPL_DELIVERY_CATEGORIES = ['batter', 'bowler', 'non-striker', 'extra_type', 'player_out', 'kind', 'BattingTeam']
+IPL_DELIVERY_NUMERIC = {
+    'ID': 'int32',
+    'innings': 'int8',
+    'overs': 'int8',
+    'ballnumber': 'int8',
+    'batsman_run': 'int8',
+    'extras_run': 'int8',
+    'total_run': 'int8',
+    'non_boundary': 'int8',
+    'isWicketDelivery': 'int8',
+}
+
+
+def type_ipl_deliveries(frame):
+    """Apply the compact IPL deliveries schema"""
+    for col in IPL_DELIVERY_CATEGORIES:
+        if col in frame.columns:
+            frame[col] = frame[col].astype('category')
+    for col, dtype in IPL_DELIVERY_NUMERIC.items():
+        if col in frame.columns:
+            frame[col] = frame[col].astype(dtype)
+    return frame
+
+
+def replace(name, frame):
+    """Swap in an updated frame for a loaded dataset (call notify_changed once consistent)"""
+    with _lock:
+        _frames[name] = frame
+        _stats[name] = dict(_stats[name], rows=int(len(frame)), columns=int(len(frame.columns)))
+
+
+def extend(name, chunk):
+    """Record rows appended to a loaded dataset as a separate chunk.
+
+    The loaded frame is left untouched, so appending never copies what is already
+    there; ``stats()`` counts the chunks alongside it.
+    """
+    with _lock:
+        _chunks.setdefault(name, []).append(chunk)
+        _stats[name] = dict(_stats[name], rows=_stats[name]['rows'] + int(len(chunk)))
+
+
+def source_path(name):
+    """Resolved CSV path a dataset was loaded from (None if it was missing)"""
+    return _sources.get(name)
+
+
+def on_change(callback):
+    """Register ``callback(name)`` to run whenever a dataset is modified or reloaded"""
+    _listeners.append(callback)
+
+
+def notify_changed(name):
+    """Tell listeners (e.g. the response cache) that a dataset's contents changed"""
+    for callback in list(_listeners):
+        callback(name)
+
+
+def memory_mb(frame):
+    """Deep memory footprint of a DataFrame in megabytes"""
+    return round(float(frame.memory_usage(deep=True).sum()) / (1024 * 1024), 2)
+
+
+def stats():
+    """Load time and current memory footprint of every loaded dataset"""
+    with _lock:
+        return {
+            name: dict(_stats[name], memory_mb=round(sum(memory_mb(f) for f in [frame] + _chunks.get(name, [])), 2))
+            for name, frame in _frames.items()
+        }
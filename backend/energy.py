@@ -1,18 +1,12 @@
-import pandas as pd
 import os
 
+import datasets
+
 # Load dataset (resolve relative path to project data folder)
-csv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'global_energy_consumption.csv'))
-if os.path.exists(csv_path):
-    df = pd.read_csv(csv_path)
-else:
-    try:
-        df = pd.read_csv('global_energy_consumption.csv')
-    except Exception:
-        df = pd.DataFrame()
+csv_path = os.path.join(datasets.DATA_DIR, 'global_energy_consumption.csv')
 
 # CLEANING FUNCTION
-def clean_energy_data():
+def clean_energy_data(df):
     df.columns = df.columns.str.strip()
 
     for col in df.select_dtypes(include="number").columns:
@@ -20,8 +14,10 @@ def clean_energy_data():
 
     for col in df.select_dtypes(include="object").columns:
         df[col] = df[col].fillna("Unspecified").str.strip()
+    return df
 
-clean_energy_data()
+# Cleaned once at load (and snapshotted by the registry)
+df = datasets.load('energy', csv_path, clean=clean_energy_data)
 
 def global_energy_summaryAPI():
     result = {
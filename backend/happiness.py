@@ -1,18 +1,13 @@
-import pandas as pd
 import os
 
+import datasets
+from text_index import fold
+
 # Load dataset (resolve relative path to project data folder)
-csv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'happiness.csv'))
-if os.path.exists(csv_path):
-    df = pd.read_csv(csv_path)
-else:
-    try:
-        df = pd.read_csv('happiness.csv')
-    except Exception:
-        df = pd.DataFrame()
+csv_path = os.path.join(datasets.DATA_DIR, 'happiness.csv')
 
 # --- Data Cleaning ---
-def clean_data():
+def clean_data(df):
     # Standardize column names
     df.columns = df.columns.str.strip()
 
@@ -23,8 +18,65 @@ def clean_data():
     # Fill missing strings
     df['Region'] = df['Region'].fillna('Unspecified')
     df['Country'] = df['Country'].fillna('Unknown')
-
-clean_data()
+    return df
+
+# Cleaned once at load (and snapshotted by the registry)
+df = datasets.load('happiness', csv_path, clean=clean_data)
+
+FACTOR_COLUMNS = [
+    'Economy (GDP per Capita)',
+    'Family',
+    'Health (Life Expectancy)',
+    'Freedom',
+    'Trust (Government Corruption)',
+    'Generosity'
+]
+
+# --- Country name index ---
+# Folded name (case/accent-insensitive) -> row position, plus common alternative names.
+# The dataset has one row per country.
+COUNTRY_ALIASES = {
+    'United States': ['USA', 'US', 'United States of America', 'America'],
+    'United Kingdom': ['UK', 'Great Britain', 'Britain'],
+    'South Korea': ['Korea', 'Republic of Korea'],
+    'Russia': ['Russian Federation'],
+    'Czech Republic': ['Czechia'],
+    'Ivory Coast': ["Côte d'Ivoire"],
+    'Congo (Kinshasa)': ['DR Congo', 'DRC', 'Democratic Republic of the Congo'],
+    'Congo (Brazzaville)': ['Republic of the Congo'],
+    'Macedonia': ['North Macedonia'],
+    'Swaziland': ['Eswatini'],
+    'Myanmar': ['Burma'],
+    'United Arab Emirates': ['UAE'],
+    'Palestinian Territories': ['Palestine'],
+    'Laos': ['Lao PDR'],
+    'Iran': ['Islamic Republic of Iran'],
+    'Syria': ['Syrian Arab Republic'],
+    'Vietnam': ['Viet Nam'],
+    'Turkey': ['Türkiye'],
+    'Somaliland region': ['Somaliland'],
+    'Taiwan': ['Chinese Taipei'],
+    'Netherlands': ['Holland', 'The Netherlands'],
+    'Kyrgyzstan': ['Kyrgyz Republic'],
+    'Bosnia and Herzegovina': ['Bosnia'],
+}
+
+country_index = {}
+for _pos, _name in enumerate(df.get('Country', [])):
+    country_index.setdefault(fold(_name), _pos)
+for _name, _aliases in COUNTRY_ALIASES.items():
+    if fold(_name) in country_index:
+        for _alias in _aliases:
+            country_index.setdefault(fold(_alias), country_index[fold(_name)])
+
+_scores = df['Happiness Score'].to_numpy() if 'Happiness Score' in df else None
+
+
+def find_country(name):
+    """Row position of a country by name or alias, or None"""
+    if not name:
+        return None
+    return country_index.get(fold(name))
 
 def top_countriesAPI(limit=8):
     result = (
@@ -52,22 +104,21 @@ def factor_impactAPI():
     
 
 def country_infoAPI(name):
-    country = df[df['Country'].str.lower() == name.lower()]
-    if country.empty:
+    pos = find_country(name)
+    if pos is None:
         return {"message": "Country data unavailable", "error": f"'{name}' not found in dataset."}
     return {
-        "result": country.iloc[0].to_dict()
+        "result": df.iloc[pos].to_dict()
     }
 
 def compare_countriesAPI(country1, country2):
-    c1 = df[df['Country'].str.lower() == country1.lower()]
-    c2 = df[df['Country'].str.lower() == country2.lower()]
+    pos1, pos2 = find_country(country1), find_country(country2)
 
-    if c1.empty or c2.empty:
+    if pos1 is None or pos2 is None:
         return {"message": "Comparison failed", "error": "One or both countries not found in dataset."}
 
-    score1 = float(c1['Happiness Score'].values[0])
-    score2 = float(c2['Happiness Score'].values[0])
+    score1 = float(_scores[pos1])
+    score2 = float(_scores[pos2])
     diff = round(abs(score1 - score2), 3)
     winner = country1 if score1 > score2 else country2
 
@@ -100,11 +151,11 @@ def happiness_gapAPI(region):
     }
 
 def country_rank_trendAPI(country):
-    data = df[df['Country'].str.lower() == country.lower()]
-    if data.empty:
+    pos = find_country(country)
+    if pos is None:
         return {"message": "Country not found", "error": f"'{country}' missing in dataset."}
 
-    rank = int(data['Happiness Rank'].values[0])
+    rank = int(df['Happiness Rank'].iat[pos])
     total = df['Happiness Rank'].count()
     percentile = round((1 - (rank / total)) * 100, 2)
     status = "Top 10%" if percentile >= 90 else "Above Average" if percentile >= 50 else "Below Average"
@@ -118,18 +169,9 @@ def country_rank_trendAPI(country):
     }
 
 def factor_averagesAPI():
-    factor_cols = [
-        'Economy (GDP per Capita)', 
-        'Family', 
-        'Health (Life Expectancy)',
-        'Freedom', 
-        'Trust (Government Corruption)', 
-        'Generosity'
-    ]
-
     result = []
 
-    for col in factor_cols:
+    for col in FACTOR_COLUMNS:
         avg_val = round(df[col].mean(), 3)
         max_val = round(df[col].max(), 3)
         min_val = round(df[col].min(), 3)
@@ -147,4 +189,47 @@ def factor_averagesAPI():
             "min_value_country": min_country
         })
     return result
-    
\ No newline at end of file
+    
+
+MAX_BATCH = 50
+
+def compare_many_countriesAPI(names):
+    """
+    Compares any number of countries on score, rank and every factor in one call.
+    Unknown names are reported rather than failing the whole batch.
+    """
+    positions, not_found = [], []
+    for name in names:
+        pos = find_country(name)
+        if pos is None:
+            not_found.append(name)
+        elif pos not in positions:
+            positions.append(pos)
+
+    if not positions:
+        return {"message": "Comparison failed", "error": "None of the countries were found in dataset.", "not_found": not_found}
+
+    rows = df.iloc[positions]
+    countries = [
+        {
+            "country": row['Country'],
+            "region": row['Region'],
+            "happiness_rank": int(row['Happiness Rank']),
+            "happiness_score": float(row['Happiness Score']),
+            "factors": {col: round(float(row[col]), 3) for col in FACTOR_COLUMNS}
+        }
+        for _, row in rows.iterrows()
+    ]
+
+    happiest = rows.loc[rows['Happiness Score'].idxmax()]
+    least_happy = rows.loc[rows['Happiness Score'].idxmin()]
+    return {
+        "summary": {
+            "happiest_country": happiest['Country'],
+            "least_happy_country": least_happy['Country'],
+            "score_range": round(float(happiest['Happiness Score'] - least_happy['Happiness Score']), 3),
+            "factor_leaders": {col: rows.loc[rows[col].idxmax(), 'Country'] for col in FACTOR_COLUMNS}
+        },
+        "data": countries,
+        "not_found": not_found
+    }
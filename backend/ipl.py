@@ -1,112 +1,308 @@
 import pandas as pd
 import numpy as np
 import json
- 
-# Load datasets
-matches = pd.read_csv("IPL_Ball_by_Ball_2008_2022 (1).csv")
-balls = pd.read_csv("IPL_Matches_2008_2022.csv")
+import os
+import threading
+import time
+from types import MappingProxyType
 
-# Merge datasets
-df = pd.merge(matches, balls, on="ID", how="left")
+import datasets
 
-# ------------------ TEAM PERFORMANCE ------------------
-def teamAPI(team_name):
-    # Matches played by team
-    team_matches = balls[(balls["Team1"] == team_name) | (balls["Team2"] == team_name)]
-    total_matches = len(team_matches)
-
-    # Wins / Loss / Tie
-    wins = (team_matches["WinningTeam"] == team_name).sum()
-    losses = ((team_matches["WinningTeam"] != team_name) & (team_matches["WinningTeam"].notna())).sum()
-    ties = team_matches[team_matches["WonBy"] == "Tie"].shape[0]
-
-    # Run Rate (BattingTeam only)
-    team_batting = df[df["BattingTeam"] == team_name]
-    total_runs = team_batting["total_run"].sum()
-    total_overs = team_batting["overs"].nunique()
-    run_rate = round(total_runs / total_overs, 2) if total_overs > 0 else 0
-
-    # Performance vs other teams
-    vs_team = (
-        team_matches.groupby("WinningTeam")
-        .size()
-        .reset_index(name="wins")
+DELIVERIES_CSV = os.path.join(datasets.BASE_DIR, "IPL_Ball_by_Ball_2008_2022 (1).csv")
+MATCHES_CSV = os.path.join(datasets.BASE_DIR, "IPL_Matches_2008_2022.csv")
+
+# Load datasets (kept as two tables; match columns are joined per query by match ID).
+# `deliveries` is the archive as loaded: ingested seasons are folded into the cubes and
+# kept as separate chunks in the registry, never concatenated onto it.
+deliveries = datasets.load('ipl_deliveries', DELIVERIES_CSV, clean=datasets.type_ipl_deliveries)
+matches = datasets.load('ipl_matches', MATCHES_CSV)
+
+
+def with_match_columns(frame, columns, match_table=None):
+    """Deliveries in ``frame`` plus the given match columns, looked up by match ID"""
+    match_table = matches if match_table is None else match_table
+    lookup = match_table.set_index("ID")[columns].reindex(frame["ID"].to_numpy())
+    return frame.assign(**{col: lookup[col].to_numpy() for col in columns})
+
+
+# ------------------ FILTER CUBES ------------------
+# Phases of an innings by (0-based) over: powerplay 0-5, middle 6-14, death 15-19
+PHASES = ["powerplay", "middle", "death"]
+PHASE_BINS = [-1, 5, 14, np.inf]
+
+# Optional filters accepted by the player and team endpoints
+FILTERS = ["season", "venue", "opponent", "phase"]
+
+# Wides and no-balls are re-bowled, so they don't count towards overs
+ILLEGAL_DELIVERIES = ["wides", "noballs"]
+
+
+class PlayerCube:
+    """Additive counters per player x season x venue x opponent x phase.
+
+    Each player's cells are a small frame indexed by the (player, season, venue,
+    opponent, phase) key, so a filter combination is a rollup over one player's cells and an
+    ingest only touches the players it has new cells for. A cube is never modified:
+    merging cells gives a new cube that shares the untouched players' cells.
+    """
+
+    def __init__(self, counters, cells=None):
+        self.counters = list(counters)
+        self._empty = pd.DataFrame(columns=["player"] + FILTERS + self.counters).astype({col: "int64" for col in self.counters})
+        # player -> cells
+        self._cells = MappingProxyType(dict(cells or {}))
+
+    def merged(self, cells):
+        """This cube plus new cells (player, filters and counter columns); counters of matching cells are summed"""
+        if cells.empty:
+            return self
+        keys = ["player"] + FILTERS
+        cells = cells.astype({col: str for col in keys}).set_index(keys)[self.counters]
+
+        # Regroup only the affected players' existing cells with the new ones
+        current = [self._cells[player] for player in pd.unique(cells.index.get_level_values("player")) if player in self._cells]
+        merged = pd.concat(current + [cells]).groupby(level=keys).sum().astype("int64")
+
+        updated = dict(self._cells)
+        updated.update(self._by_player(merged))
+        return PlayerCube(self.counters, updated)
+
+    @staticmethod
+    def _by_player(table):
+        """Each player's contiguous slice of a key-indexed table"""
+        players = table.index.get_level_values("player")
+        starts = np.flatnonzero(np.r_[True, players[1:] != players[:-1]])
+        ends = np.r_[starts[1:], len(table)]
+        return {players[start]: table.iloc[start:end] for start, end in zip(starts, ends)}
+
+    def __getstate__(self):
+        # Pickled as one table: far quicker to load than a frame per player
+        return {"counters": self.counters, "table": pd.concat(list(self._cells.values())) if self._cells else None}
+
+    def __setstate__(self, state):
+        table = state["table"]
+        self.__init__(state["counters"], self._by_player(table) if table is not None else None)
+
+    def players(self):
+        return list(self._cells)
+
+    def totals(self, counter):
+        """One counter summed over all of each player's cells"""
+        return pd.Series({player: int(cells[counter].sum()) for player, cells in self._cells.items()}, dtype="int64")
+
+    def rows(self, player, filters=None):
+        """Cells of ``player`` matching every non-empty filter"""
+        cells = self._cells.get(player)
+        if cells is None:
+            return self._empty
+        rows = cells.reset_index()
+        for dim, value in (filters or {}).items():
+            if value is not None:
+                rows = rows[rows[dim] == value]
+        return rows
+
+
+def with_context(frame, match_table=None):
+    """Deliveries plus season, venue, bowling side and phase of innings"""
+    frame = with_match_columns(frame, ["Season", "Venue", "Team1", "Team2"], match_table)
+    batting_team = frame["BattingTeam"].to_numpy(dtype=object)
+    return frame.assign(
+        # Opponent of the batting side for every ball
+        BowlingTeam=np.where(batting_team == frame["Team2"].to_numpy(), frame["Team1"], frame["Team2"]),
+        phase=pd.cut(frame["overs"], bins=PHASE_BINS, labels=PHASES),
+        legal=~frame["extra_type"].isin(ILLEGAL_DELIVERIES),
+        wicket=(frame["isWicketDelivery"] == 1) & frame["player_out"].notna(),
+        dismissed=frame["player_out"].to_numpy(dtype=object) == frame["batter"].to_numpy(dtype=object)
+    )
+
+
+def _cells(frame, player, opponent, **counters):
+    cells = (
+        frame.groupby([player, "Season", "Venue", opponent, "phase"], observed=True)
+        .agg(**counters)
+        .reset_index()
     )
+    cells.columns = ["player"] + FILTERS + list(counters)
+    return cells
+
+
+def add_deliveries(cubes, frame, match_table=None):
+    """``(batting, bowling, team batting)`` cubes with ball-by-ball rows folded in (counts are additive)"""
+    batting, bowling, team_batting = cubes
+    frame = with_context(frame, match_table)
+
+    batting = batting.merged(_cells(
+        frame, "batter", "BowlingTeam",
+        runs=("batsman_run", "sum"),
+        balls=("ballnumber", "size"),
+        dismissals=("dismissed", "sum")
+    ))
+    bowling = bowling.merged(_cells(
+        frame, "bowler", "BattingTeam",
+        balls_bowled=("ballnumber", "size"),
+        runs_conceded=("total_run", "sum"),
+        wickets=("wicket", "sum")
+    ))
+    # Super overs (innings 3+) don't count towards a team's run rate
+    team_batting = team_batting.merged(_cells(
+        frame[frame["innings"] <= 2], "BattingTeam", "BowlingTeam",
+        runs=("total_run", "sum"),
+        legal_balls=("legal", "sum")
+    ))
+    return batting, bowling, team_batting
+
+
+def _applied(filters):
+    return {dim: value for dim, value in (filters or {}).items() if value is not None}
+
+
+# ------------------ TEAM PERFORMANCE ------------------
+def results_table(frame):
+    """One row per team per match, with the opponent and the result"""
+    sides = [
+        pd.DataFrame({
+            "ID": frame["ID"],
+            "season": frame["Season"],
+            "venue": frame["Venue"],
+            "team": frame[team_col],
+            "opponent": frame[opponent_col],
+            "won": frame["WinningTeam"] == frame[team_col],
+            "lost": frame["WinningTeam"] == frame[opponent_col],
+            "tied": frame["WonBy"] == "SuperOver",   # level after 20 overs, decided by a super over
+            "no_result": frame["WinningTeam"].isna()
+        })
+        for team_col, opponent_col in (("Team1", "Team2"), ("Team2", "Team1"))
+    ]
+    return pd.concat(sides, ignore_index=True)
+
+
+results = results_table(matches)
+
+OUTCOME = dict(
+    matches=("ID", "size"),
+    wins=("won", "sum"),
+    losses=("lost", "sum"),
+    ties=("tied", "sum"),
+    no_result=("no_result", "sum")
+)
+
+
+def _run_rate(runs, legal_balls):
+    return round(runs / (legal_balls / 6), 2) if legal_balls > 0 else 0
+
+
+def _team_record(team_name, filters=None, result_table=None, cube=None):
+    filters = _applied(filters)
+    result_table = results if result_table is None else result_table
+    cube = team_batting_cube if cube is None else cube
+
+    # Results don't depend on the phase; scoring honours every filter
+    team_results = result_table[result_table["team"] == team_name]
+    for dim in ("season", "venue", "opponent"):
+        if dim in filters:
+            team_results = team_results[team_results[dim] == filters[dim]]
+    batting = cube.rows(team_name, filters)
+
+    runs = int(batting["runs"].sum())
+    legal_balls = int(batting["legal_balls"].sum())
+
+    vs_team = team_results.groupby("opponent").agg(**OUTCOME).reset_index()
+
+    season_runs = batting.groupby("season")[["runs", "legal_balls"]].sum()
+    seasons = []
+    for season in team_results.groupby("season").agg(**OUTCOME).reset_index().to_dict(orient="records"):
+        runs_in_season = int(season_runs["runs"].get(season["season"], 0))
+        balls_in_season = int(season_runs["legal_balls"].get(season["season"], 0))
+        seasons.append(dict(season, runs=runs_in_season, run_rate=_run_rate(runs_in_season, balls_in_season)))
 
     return {
         "team": team_name,
-        "total_matches": int(total_matches),
-        "wins": int(wins),
-        "losses": int(losses),
-        "ties": int(ties),
-        "run_rate": run_rate,
-        "vs_team": vs_team.to_dict(orient="records")
+        "filters": filters,
+        "total_matches": len(team_results),
+        "wins": int(team_results["won"].sum()),
+        "losses": int(team_results["lost"].sum()),
+        "ties": int(team_results["tied"].sum()),
+        "no_result": int(team_results["no_result"].sum()),
+        "runs": runs,
+        "run_rate": _run_rate(runs, legal_balls),
+        "vs_team": vs_team.to_dict(orient="records"),
+        "seasons": seasons
     }
 
+
+def _aggregates():
+    cubes = add_deliveries((
+        PlayerCube(["runs", "balls", "dismissals"]),
+        PlayerCube(["balls_bowled", "runs_conceded", "wickets"]),
+        PlayerCube(["runs", "legal_balls"]),   # regular innings only
+    ), deliveries)
+    # Unfiltered records for every team
+    records = {team: _team_record(team, result_table=results, cube=cubes[2]) for team in results["team"].dropna().unique()}
+    return cubes, records
+
+
+# Built once and snapshotted with the datasets, so later boots only load them
+(batting_cube, bowling_cube, team_batting_cube), team_records = datasets.derived(
+    'ipl_aggregates', _aggregates, 'ipl_deliveries', 'ipl_matches')
+
+
+def teamAPI(team_name, **filters):
+    if not _applied(filters) and team_name in team_records:
+        return team_records[team_name]
+    return _team_record(team_name, filters)
+
 # ------------------ BOWLER PERFORMANCE ------------------
-def bowlerAPI(bowler_name):
-    bowler_data = df[df["bowler"] == bowler_name]
+def bowlerAPI(bowler_name, **filters):
+    cells = bowling_cube.rows(bowler_name, filters)
 
-    total_balls = len(bowler_data)
-    total_runs = bowler_data["total_run"].sum()
-    wickets = bowler_data[bowler_data["isWicketDelivery"] == 1]["player_out"].count()
+    total_balls = int(cells["balls_bowled"].sum())
+    total_runs = int(cells["runs_conceded"].sum())
     economy = round(total_runs / (total_balls / 6), 2) if total_balls > 0 else 0
 
     vs_team = (
-        bowler_data.groupby("BattingTeam")
-        .agg(
-            balls_bowled=("ballnumber", "count"),
-            runs_conceded=("total_run", "sum"),
-            wickets=("player_out", "count")
-        )
+        cells.groupby("opponent")[["balls_bowled", "runs_conceded", "wickets"]]
+        .sum()
+        .rename_axis("BattingTeam")
         .reset_index()
     )
 
     return {
         "bowler": bowler_name,
+        "filters": _applied(filters),
         "overall": {
-            "balls_bowled": int(total_balls),
-            "runs_conceded": int(total_runs),
-            "wickets": int(wickets),
+            "balls_bowled": total_balls,
+            "runs_conceded": total_runs,
+            "wickets": int(cells["wickets"].sum()),
             "economy": economy
         },
         "vs_team": vs_team.to_dict(orient="records")
     }
 
 # ------------------ BATSMAN PERFORMANCE ------------------
-def batsmanAPI(batsman_name):
-    # Filter only this batsman
-    bat_data = df[df["batter"] == batsman_name].copy()
-
-    # Derive BowlingTeam = opponent of BattingTeam
-    bat_data["BowlingTeam"] = bat_data.apply(
-        lambda x: x["Team1"] if x["BattingTeam"] == x["Team2"] else x["Team2"],
-        axis=1
-    )
+def batsmanAPI(batsman_name, **filters):
+    cells = batting_cube.rows(batsman_name, filters)
 
     # Overall stats
-    total_runs = bat_data["batsman_run"].sum()
-    balls_faced = len(bat_data)
-    dismissals = bat_data[bat_data["player_out"] == batsman_name].shape[0]
+    total_runs = int(cells["runs"].sum())
+    balls_faced = int(cells["balls"].sum())
+    dismissals = int(cells["dismissals"].sum())
     avg = round(total_runs / dismissals, 2) if dismissals > 0 else total_runs
     strike_rate = round((total_runs / balls_faced) * 100, 2) if balls_faced > 0 else 0
 
     # Vs Team stats
     vs_team = (
-        bat_data.groupby("BowlingTeam")
-        .agg(
-            runs=("batsman_run", "sum"),
-            balls=("ballnumber", "count"),
-            dismissals=("player_out", lambda x: (x == batsman_name).sum())
-        )
+        cells.groupby("opponent")[["runs", "balls", "dismissals"]]
+        .sum()
+        .rename_axis("BowlingTeam")
         .reset_index()
     )
 
     return {
         "batsman": batsman_name,
+        "filters": _applied(filters),
         "overall": {
-            "runs": int(total_runs),
-            "balls_faced": int(balls_faced),
+            "runs": total_runs,
+            "balls_faced": balls_faced,
             "average": avg,
             "strike_rate": strike_rate
         },
@@ -114,10 +310,93 @@ def batsmanAPI(batsman_name):
     }
 
 
+# ------------------ INGESTION ------------------
+_ingest_lock = threading.Lock()
+
+
+def _check_columns(frame, expected, label):
+    missing = [col for col in expected.columns if col not in frame.columns]
+    if missing:
+        raise ValueError(f"{label} CSV is missing columns: {', '.join(missing)}")
+
+
+def _append_csv(frame, path):
+    # Match the existing file's columns and line endings
+    header = pd.read_csv(path, nrows=0).columns
+    with open(path, "rb") as f:
+        f.seek(max(os.path.getsize(path) - 2, 0))
+        tail = f.read()
+    newline = "\r\n" if tail.endswith(b"\r\n") else "\n"
+    with open(path, "a", newline="") as f:
+        if tail and not tail.endswith(b"\n"):
+            f.write(newline)
+        frame.reindex(columns=header).to_csv(f, header=False, index=False, na_rep="NA", lineterminator=newline)
+
+
+def ingest_season(deliveries_source, matches_source, persist=True):
+    """Append new matches and their deliveries, updating the aggregates incrementally.
+
+    Sources are CSV paths or file objects with the same columns as the bundled files.
+    Matches that are already loaded are skipped, so re-running an ingest is safe.
+    Only the new rows are aggregated and stored; the loaded deliveries are not copied.
+    """
+    global matches, results, team_records, batting_cube, bowling_cube, team_batting_cube
+    start = time.perf_counter()
+
+    # Season labels mix "2019" and "2020/21"; keep them as text like the bundled file
+    new_matches = pd.read_csv(matches_source, dtype={"Season": str})
+    new_deliveries = pd.read_csv(deliveries_source)
+    _check_columns(new_matches, matches, "matches")
+    _check_columns(new_deliveries, deliveries, "deliveries")
+
+    with _ingest_lock:
+        known = matches["ID"]
+        skipped = new_matches["ID"].isin(known)
+        new_matches = new_matches.loc[~skipped, matches.columns].drop_duplicates("ID")
+
+        orphans = ~new_deliveries["ID"].isin(known) & ~new_deliveries["ID"].isin(new_matches["ID"])
+        if orphans.any():
+            raise ValueError(f"{int(orphans.sum())} deliveries reference match IDs missing from the matches CSV")
+        new_deliveries = new_deliveries[new_deliveries["ID"].isin(new_matches["ID"])]
+        new_deliveries = datasets.type_ipl_deliveries(new_deliveries[deliveries.columns].copy())
+
+        if len(new_matches):
+            # Build every new table aside first, so a failure leaves the loaded state untouched
+            # (the matches table is one row per match, small enough to rebuild)
+            new_match_table = pd.concat([matches, new_matches], ignore_index=True)
+            cubes = add_deliveries((batting_cube, bowling_cube, team_batting_cube), new_deliveries, new_match_table)
+            new_results = pd.concat([results, results_table(new_matches)], ignore_index=True)
+            new_records = dict(team_records)
+            for team in pd.unique(new_matches[["Team1", "Team2"]].to_numpy().ravel()):
+                new_records[team] = _team_record(team, result_table=new_results, cube=cubes[2])
+
+            # Then publish them together
+            matches, results, team_records = new_match_table, new_results, new_records
+            batting_cube, bowling_cube, team_batting_cube = cubes
+            datasets.replace('ipl_matches', matches)
+            datasets.extend('ipl_deliveries', new_deliveries)
+
+            if persist:
+                _append_csv(new_matches, datasets.source_path('ipl_matches') or MATCHES_CSV)
+                _append_csv(new_deliveries, datasets.source_path('ipl_deliveries') or DELIVERIES_CSV)
+
+    if len(new_matches):
+        datasets.notify_changed('ipl_matches')
+        datasets.notify_changed('ipl_deliveries')
+
+    return {
+        "matches_added": int(len(new_matches)),
+        "deliveries_added": int(len(new_deliveries)),
+        "matches_skipped": int(skipped.sum()),
+        "seasons": sorted(new_matches["Season"].astype(str).unique().tolist()),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
 # ------------------ ALL BOWLERS ------------------
 def allBowlers():
-    return json.dumps(sorted(df["bowler"].unique().tolist()))
+    return json.dumps(sorted(bowling_cube.players()))
 
 # ------------------ ALL BATSMEN ------------------
 def allBatsmen():
-    return json.dumps(sorted(df["batter"].unique().tolist()))
+    return json.dumps(sorted(batting_cube.players()))
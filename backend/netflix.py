@@ -1,37 +1,141 @@
 import pandas as pd
 import numpy as np
+import ast
+import difflib
 import os
+import sys
+from functools import lru_cache
+
+import datasets
+from text_index import fold
 
 # Resolve path relative to backend folder -> ../data/netflix_cleaned.csv
-csv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'netflix_cleaned.csv'))
-if os.path.exists(csv_path):
-    df = pd.read_csv(csv_path)
-else:
-    # Fallback: try to read from current directory or set empty DataFrame
-    try:
-        df = pd.read_csv('netflix_cleaned.csv')
-    except Exception:
-        df = pd.DataFrame()
+csv_path = os.path.join(datasets.DATA_DIR, 'netflix_cleaned.csv')
 
-def movie_by_titleAPI(title):
-    title = title.strip().lower()
-    
-    movie = df[(df['type'].str.lower() == 'movie') &
-               (df['title'].str.lower() == title)]
-    
-    if movie.empty:
-        return {
-            "message": f"No movie found with title '{title}'."
-        }
-    row = movie.iloc[0]
+def clean_rating_column(df):
+    """
+    Cleans the 'rating' column by removing invalid entries like '74 min', '88 min', etc.
+    Keeps only standard rating categories such as TV-MA, TV-14, R, PG, etc.
+    """
+    df['rating'] = df['rating'].fillna('Unspecified').astype(str).str.strip()
+
+    # Define valid rating types (based on Netflix's standard ratings)
+    valid_ratings = [
+        'TV-MA', 'TV-14', 'TV-PG', 'TV-Y7', 'TV-Y', 'R', 'PG-13',
+        'PG', 'G', 'NC-17', 'NR', 'UR', 'Unspecified'
+    ]
     
-    row_dict = row.to_dict()
+    # Replace anything that looks like a duration (e.g., '74 min', '120 min', '1 Season')
+    df['rating'] = df['rating'].apply(lambda x: x if x in valid_ratings else 'Unspecified')
+    return df
+
+def clean_netflix(df):
+    """
+    All per-column normalization, done once at load. The aggregate endpoints used to
+    redo this on every request; the frame is read-only after this.
+    """
+    df = clean_rating_column(df)
+    df['type'] = df['type'].fillna('Unspecified').astype(str).str.strip()
+    df['Main_director'] = df['Main_director'].astype(str).str.strip()
+    df['country'] = df['country'].fillna('Unspecified').astype(str)
+
+    # "September 25, 2021" -> datetime; "90 min" / "2 Seasons" -> numeric columns
+    df['date_added'] = pd.to_datetime(df['date_added'].astype(str).str.strip(), format='%B %d, %Y', errors='coerce')
+    parts = df['duration'].astype(str).str.extract(r'(\d+)\s*(min|Season)', expand=True)
+    amount = pd.to_numeric(parts[0], errors='coerce')
+    df['duration_minutes'] = amount.where(parts[1] == 'min').astype('Int16')
+    df['seasons'] = amount.where(parts[1] == 'Season').astype('Int8')
+    return df
+
+# Cleaned once at load (and snapshotted by the registry)
+df = datasets.load('netflix', csv_path, clean=clean_netflix)
+
+# ------------------ TITLE INDEX ------------------
+# Normalized title -> row position, per type ("movie", "tv show"), built once.
+# The first row wins when a title appears twice.
+FUZZY_CUTOFF = 0.8
+MAX_FUZZY_CANDIDATES = 200  # titles scored by difflib per lookup
+
+def _bigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _title_tables():
+    index = {}
+    for pos, (title_type, title) in enumerate(zip(df['type'].str.lower(), df['title'])):
+        if isinstance(title, str):
+            index.setdefault(title_type, {}).setdefault(fold(title), pos)
+
+    # Per type: the title keys, and sorted (bigram, key id) pairs. Fuzzy matching only
+    # scores the titles sharing the most character bigrams with the query, which
+    # survives typos anywhere in the title.
+    keys_by_type, grams_by_type = {}, {}
+    for title_type, titles in index.items():
+        keys = list(titles)
+        grams, owners = [], []
+        for i, key in enumerate(keys):
+            for gram in _bigrams(key):
+                grams.append(gram)
+                owners.append(i)
+        order = np.argsort(np.array(grams, dtype=str), kind='stable')
+        keys_by_type[title_type] = keys
+        grams_by_type[title_type] = (np.array(grams, dtype=str)[order], np.array(owners, dtype=np.int64)[order])
+    return index, keys_by_type, grams_by_type
+
+
+# Built once and snapshotted with the dataset
+title_index, _title_keys, _title_grams = datasets.derived('netflix_titles', _title_tables, 'netflix')
+
+
+def _fuzzy_candidates(key, title_type):
+    """Titles sharing the most character bigrams with the query"""
+    sorted_grams, owners = _title_grams[title_type]
+    keys = _title_keys[title_type]
+    grams = sorted(_bigrams(key))
+    lo = np.searchsorted(sorted_grams, grams, side='left')
+    hi = np.searchsorted(sorted_grams, grams, side='right')
+    if not (hi - lo).any():
+        return []
+    shared = np.bincount(np.concatenate([owners[a:b] for a, b in zip(lo, hi)]), minlength=len(keys))
+    ids = np.flatnonzero(shared)
+    ids = ids[np.argsort(-shared[ids], kind='stable')][:MAX_FUZZY_CANDIDATES]
+    return [keys[i] for i in ids]
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_match(key, title_type):
+    # Memoised, misses included: the catalog is read-only after load
+    close = difflib.get_close_matches(key, _fuzzy_candidates(key, title_type), n=1, cutoff=FUZZY_CUTOFF)
+    return title_index[title_type][close[0]] if close else None
+
+
+def find_title(title, title_type):
+    """Row position of a title of the given type: exact (normalized) match first, then the closest fuzzy match.
+
+    Returns ``(position, exact)``, or ``(None, False)`` when nothing is close enough.
+    """
+    titles = title_index.get(title_type)
+    if not titles:
+        return None, False
+    key = fold(title)
+    if key in titles:
+        return titles[key], True
+    pos = _fuzzy_match(key, title_type)
+    if pos is not None:
+        return pos, False
+    return None, False
+
+
+def _title_record(pos, exact):
+    row_dict = df.iloc[pos].to_dict()
     # convert numpy.int64 to python int
     for key,value in row_dict.items():
         if isinstance(value ,(np.int64,np.float64)):
             row_dict[key] = int(value)
     return {
             "title": row_dict.get("title"),
+            "exact_match": exact,
             "main_director": row_dict.get("Main_director"),
             "cast": row_dict.get("cast"),
             "country": row_dict.get("country"),
@@ -42,41 +146,124 @@ def movie_by_titleAPI(title):
             "description": row_dict.get("description")
         }
 
+
+def movie_by_titleAPI(title):
+    title = title.strip().lower()
+
+    pos, exact = find_title(title, 'movie')
+    if pos is None:
+        return {
+            "message": f"No movie found with title '{title}'."
+        }
+    return _title_record(pos, exact)
+
 def tvshow_by_titleAPI(title):
     title = title.strip().lower()
-    
-    show = df[(df['type'].str.lower() == 'tv show') &
-               (df['title'].str.lower() == title)]
-    
-    if show.empty:
+
+    pos, exact = find_title(title, 'tv show')
+    if pos is None:
         return {
             "message": f"No tv show found with title '{title}'."
         }
-    row = show.iloc[0]
-    
-    row_dict = row.to_dict()
-    # convert numpy.int64 to python int
-    for key,value in row_dict.items():
-        if isinstance(value ,(np.int64,np.float64)):
-            row_dict[key] = int(value)
-    return {
-            "title": row_dict.get("title"),
-            "main_director": row_dict.get("Main_director"),
-            "cast": row_dict.get("cast"),
-            "country": row_dict.get("country"),
-            "release_year": row_dict.get("release_year"),
-            "rating": row_dict.get("rating"),
-            "duration": row_dict.get("duration"),
-            "genres": row_dict.get("genres"),
-            "description": row_dict.get("description")
+    return _title_record(pos, exact)
+
+# ------------------ BRIDGE TABLES ------------------
+# genres, cast and country hold several values per title ("['Dramas', 'Thrillers']",
+# "A, B, C"). Each is exploded once into a (pos, value) table: pos is the title's row
+# position in df, values are interned and stored as a categorical.
+PLACEHOLDERS = {'', 'Unknown', 'Unspecified', 'nan'}
+
+
+def _split_list(value):
+    return str(value).split(',')
+
+
+def _parse_genres(value):
+    # Stored as a stringified Python list; older rows may be a plain comma string
+    value = str(value)
+    if value.startswith('['):
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value.strip('[]').replace("'", '').split(',')
+    return value.split(',')
+
+
+def _bridge(values, parse, name):
+    positions, items = [], []
+    for pos, value in enumerate(values):
+        # Each value once per title, in listed order
+        for item in dict.fromkeys(part.strip() for part in parse(value)):
+            if item not in PLACEHOLDERS:
+                positions.append(pos)
+                items.append(sys.intern(item))
+    return pd.DataFrame({
+        'pos': np.array(positions, dtype=np.int32),
+        name: pd.Categorical(items),
+    })
+
+
+def _bridges():
+    return (
+        _bridge(df['genres'], _parse_genres, 'genre'),
+        _bridge(df['cast'], _split_list, 'actor'),
+        _bridge(df['country'], _split_list, 'country'),
+    )
+
+
+title_genres, title_cast, title_countries = datasets.derived('netflix_bridges', _bridges, 'netflix')
+
+# Genres of each title by row position (bridge rows are in position order)
+_genre_bounds = np.searchsorted(title_genres['pos'].to_numpy(), np.arange(len(df) + 1))
+_genre_values = title_genres['genre'].to_numpy(dtype=object)
+genres_by_pos = [_genre_values[a:b].tolist() for a, b in zip(_genre_bounds[:-1], _genre_bounds[1:])]
+
+_types = df['type'].to_numpy(dtype=object)
+_type_names = {fold(t): t for t in pd.unique(_types)}
+
+# Title x genre incidence, for co-occurrence counts
+_genres = np.asarray(title_genres['genre'].cat.categories, dtype=object)
+_genre_lookup = {fold(genre): i for i, genre in enumerate(_genres)}
+_incidence = np.zeros((len(df), len(_genres)), dtype=np.int32)
+_incidence[title_genres['pos'].to_numpy(), title_genres['genre'].cat.codes.to_numpy()] = 1
+genre_cooccurrence = _incidence.T @ _incidence
+
+
+def _top_values(bridge, name, limit, title_type=None):
+    """Most frequent values of a bridge table, optionally for one title type"""
+    if title_type:
+        bridge = bridge[_types[bridge['pos'].to_numpy()] == _type_names.get(fold(title_type))]
+    counts = bridge[name].value_counts()
+    counts = counts[counts > 0].head(limit)
+    return [{name: value, 'title_count': int(count)} for value, count in counts.items()]
+
+
+def _country_genres():
+    """Genre mix per country, as {folded country: record}"""
+    pairs = title_countries.merge(title_genres, on='pos')
+    totals = title_countries['country'].value_counts()
+    mix = {}
+    for country, group in pairs.groupby('country', observed=True):
+        counts = group['genre'].value_counts()
+        counts = counts[counts > 0]
+        total = int(totals[country])
+        mix[fold(country)] = {
+            'country': country,
+            'title_count': total,
+            'genres': [
+                {'genre': genre, 'title_count': int(count), 'percentage': round(count / total * 100, 2)}
+                for genre, count in counts.items()
+            ],
         }
+    return mix
 
-def movie_tv_distributionAPI():
-    # Returns the count and percentage distribution of Movies and TV Shows.
 
-    # Clean and standardize the 'type' column
-    df['type'] = df['type'].fillna('Unspecified').astype(str).str.strip()
+country_genres = _country_genres()
+
+# ------------------ AGGREGATES ------------------
+# Precomputed once from the cleaned frame; the API functions just return them.
 
+def _type_distribution():
     # Count number of each type
     type_counts = df['type'].value_counts().reset_index()
     type_counts.columns = ['type', 'count']
@@ -84,14 +271,9 @@ def movie_tv_distributionAPI():
     # Calculate percentage
     total = type_counts['count'].sum()
     type_counts['percentage'] = (type_counts['count'] / total * 100).round(2)
-
-    # Convert to list of dicts for JSON output
     return type_counts.to_dict(orient='records')
 
-def top_10_directorsAPI():
-    # Ensure consistent naming
-    df['Main_director'] = df['Main_director'].astype(str).str.strip()
-
+def _top_directors():
     # Exclude unspecified directors
     directors = df[df['Main_director'].str.lower() != 'unspecified']
 
@@ -103,61 +285,175 @@ def top_10_directorsAPI():
         .sort_values(by='title_count', ascending=False)
         .head(10)
     )
-    # Convert to JSON serializable format
     return top_directors.to_dict(orient='records')
 
-def country_statsAPI():
-    # Returns top 10 countries where Netflix is mostly used (by number of titles).
+def _top_countries():
+    # Co-productions count towards every listed country
+    return _top_values(title_countries, 'country', 10)
 
-    # Clean country data
-    df['country'] = df['country'].fillna('Unspecified').astype(str)
-    df['country'] = df['country'].apply(lambda x: x.split(',')[0].strip())  # handle multiple country entries
+def _rating_distribution():
+    # Count how many titles per rating
+    rating_counts = df['rating'].value_counts().reset_index()
+    rating_counts.columns = ['rating', 'count']
 
-    # Exclude unspecified countries
-    country_stats = (
-        df[df['country'].str.lower() != 'unspecified']
-        .groupby('country')
-        .size()
-        .reset_index(name='title_count')
-        .sort_values(by='title_count', ascending=False)
-        .head(10)
-    )
-    # Convert to list of dictionaries for JSON output
-    return country_stats.to_dict(orient='records')
+    # Calculate total and percentage
+    total = rating_counts['count'].sum()
+    rating_counts['percentage'] = (rating_counts['count'] / total * 100).round(2)
+    return rating_counts.to_dict(orient='records')
 
-def clean_rating_column():
-    """
-    Cleans the 'rating' column by removing invalid entries like '74 min', '88 min', etc.
-    Keeps only standard rating categories such as TV-MA, TV-14, R, PG, etc.
-    """
-    df['rating'] = df['rating'].fillna('Unspecified').astype(str).str.strip()
+type_distribution = _type_distribution()
+top_directors = _top_directors()
+top_countries = _top_countries()
+rating_distribution = _rating_distribution()
 
-    # Define valid rating types (based on Netflix's standard ratings)
-    valid_ratings = [
-        'TV-MA', 'TV-14', 'TV-PG', 'TV-Y7', 'TV-Y', 'R', 'PG-13',
-        'PG', 'G', 'NC-17', 'NR', 'UR', 'Unspecified'
-    ]
-    
-    # Replace anything that looks like a duration (e.g., '74 min', '120 min', '1 Season')
-    df['rating'] = df['rating'].apply(lambda x: x if x in valid_ratings else 'Unspecified')
+def movie_tv_distributionAPI():
+    # Returns the count and percentage distribution of Movies and TV Shows.
+    return type_distribution
+
+def top_10_directorsAPI():
+    return top_directors
 
-clean_rating_column()
+def country_statsAPI():
+    # Returns top 10 countries where Netflix is mostly used (by number of titles).
+    return top_countries
 
 def rating_distributionAPI():
     """
     Returns the percentage distribution of titles based on their rating type
     (like TV-MA, TV-14, PG-13, etc.)
     """
-    # Handle missing values
-    df['rating'] = df['rating'].fillna('Unspecified').astype(str)
+    return rating_distribution
 
-    # Count how many titles per rating
-    rating_counts = df['rating'].value_counts().reset_index()
-    rating_counts.columns = ['rating', 'count']
+# Limits for the genre / actor / country analytics endpoints
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
 
-    # Calculate total and percentage
-    total = rating_counts['count'].sum()
-    rating_counts['percentage'] = (rating_counts['count'] / total * 100).round(2)
+def top_genresAPI(limit=DEFAULT_LIMIT, title_type=None):
+    # Genres by number of titles, optionally only Movies or TV Shows
+    return _top_values(title_genres, 'genre', limit, title_type)
+
+def top_actorsAPI(limit=DEFAULT_LIMIT, title_type=None):
+    return _top_values(title_cast, 'actor', limit, title_type)
+
+def genre_cooccurrenceAPI(genre=None, limit=DEFAULT_LIMIT):
+    """
+    Genres most often listed together. With a genre, the genres that appear
+    alongside it; without one, the most common genre pairs.
+    """
+    if genre:
+        i = _genre_lookup.get(fold(genre))
+        if i is None:
+            return {"message": f"No genre found with name '{genre}'."}
+        counts = genre_cooccurrence[i].copy()
+        counts[i] = 0
+        top = np.argsort(-counts, kind='stable')[:limit]
+        return {
+            "genre": _genres[i],
+            "title_count": int(genre_cooccurrence[i, i]),
+            "cooccurring": [
+                {"genre": _genres[j], "title_count": int(counts[j])}
+                for j in top if counts[j] > 0
+            ]
+        }
+
+    rows, cols = np.triu_indices(len(_genres), k=1)
+    counts = genre_cooccurrence[rows, cols]
+    top = np.argsort(-counts, kind='stable')[:limit]
+    return {
+        "pairs": [
+            {"genres": [_genres[rows[k]], _genres[cols[k]]], "title_count": int(counts[k])}
+            for k in top if counts[k] > 0
+        ]
+    }
+
+def country_genresAPI(country, limit=DEFAULT_LIMIT):
+    # Genre mix of one country's titles (co-productions included)
+    record = country_genres.get(fold(country))
+    if record is None:
+        return {"message": f"No titles found for country '{country}'."}
+    return dict(record, genres=record['genres'][:limit])
+
+# ------------------ TIMELINE ------------------
+# Catalog growth, runtimes and release-to-added lag, precomputed from the parsed
+# date_added / duration columns.
+RUNTIME_BIN = 15          # minutes per movie runtime bucket
+RUNTIME_CAP = 180         # everything longer lands in one "180+" bucket
+LAG_BINS = [-np.inf, 0, 1, 2, 5, 10, 20, np.inf]
+LAG_LABELS = ['same year or earlier', '1 year', '2 years', '3-5 years', '6-10 years', '11-20 years', '21+ years']
+
+
+def _additions(period):
+    added = df[df['date_added'].notna()]
+    key = added['date_added'].dt.to_period(period).astype(str)
+    counts = pd.crosstab(key, added['type']).sort_index()
+    counts['total'] = counts.sum(axis=1)
+    counts['cumulative'] = counts['total'].cumsum()
+    label = 'year' if period == 'Y' else 'month'
+    counts.columns = [column.lower().replace(' ', '_') for column in counts.columns]
+
+    records = []
+    for index, row in counts.iterrows():
+        record = {label: int(index) if period == 'Y' else index}
+        record.update({column: int(value) for column, value in row.items()})
+        records.append(record)
+    return records
+
+
+def _runtime_distribution():
+    minutes = df['duration_minutes'].dropna().astype(int)
+    edges = list(range(0, RUNTIME_CAP + RUNTIME_BIN, RUNTIME_BIN))
+    buckets = pd.cut(minutes.clip(upper=RUNTIME_CAP), edges + [np.inf], right=False)
+    movie_counts = buckets.value_counts(sort=False)
+    labels = [f"{lo}-{lo + RUNTIME_BIN - 1} min" for lo in edges[:-1]] + [f"{RUNTIME_CAP}+ min"]
+
+    seasons = df['seasons'].dropna().astype(int).value_counts().sort_index()
+    return {
+        "movies": {
+            "count": int(len(minutes)),
+            "mean_minutes": round(float(minutes.mean()), 1) if len(minutes) else None,
+            "median_minutes": float(minutes.median()) if len(minutes) else None,
+            "histogram": [{"bucket": label, "count": int(count)} for label, count in zip(labels, movie_counts)],
+        },
+        "tv_shows": {
+            "count": int(seasons.sum()),
+            "mean_seasons": round(float((seasons.index * seasons).sum() / seasons.sum()), 2) if len(seasons) else None,
+            "histogram": [{"seasons": int(n), "count": int(count)} for n, count in seasons.items()],
+        },
+    }
+
+
+def _release_lag():
+    added = df[df['date_added'].notna()]
+    lag = added['date_added'].dt.year - added['release_year']
+    buckets = pd.cut(lag, LAG_BINS, labels=LAG_LABELS).value_counts(sort=False)
+    by_year = lag.groupby(added['date_added'].dt.year).agg(['median', 'mean'])
+    return {
+        "median_lag_years": float(lag.median()) if len(lag) else None,
+        "by_type": [
+            {"type": t, "median_lag_years": float(v.median()), "mean_lag_years": round(float(v.mean()), 2)}
+            for t, v in lag.groupby(added['type'])
+        ],
+        "histogram": [{"lag": label, "count": int(count)} for label, count in buckets.items()],
+        "by_added_year": [
+            {"year": int(year), "median_lag_years": float(row['median']), "mean_lag_years": round(float(row['mean']), 2)}
+            for year, row in by_year.iterrows()
+        ],
+    }
+
+
+additions = {'year': _additions('Y'), 'month': _additions('M')}
+runtime_distribution = _runtime_distribution()
+release_lag = _release_lag()
+
+def catalog_additionsAPI(period='year'):
+    # Titles added to the catalog per year or month, split by type, with a running total
+    if period not in additions:
+        return {"message": f"Unknown period '{period}'. Use 'year' or 'month'."}
+    return {"period": period, "data": additions[period]}
+
+def runtime_distributionAPI():
+    return runtime_distribution
 
-    # Convert to JSON serializable format
-    return rating_counts.to_dict(orient='records')
\ No newline at end of file
+def release_lagAPI():
+    # Years between a title's release and its arrival on Netflix
+    return release_lag
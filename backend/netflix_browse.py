@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+import netflix
+from text_index import fold
+
+# Faceted browsing of the Netflix catalog. Every facet value owns a packed bitmap
+# (one bit per title, np.packbits), so a filter combination is a handful of ANDs over
+# ~1 KB arrays instead of a pandas filter chain.
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+FACETS = ['type', 'rating', 'country', 'genre']
+SORTS = ['added', 'release_year', 'title']
+
+df = netflix.df
+_n = len(df)
+
+
+def _pack(mask):
+    return np.packbits(mask)
+
+
+ALL = _pack(np.ones(_n, dtype=bool))
+NONE = _pack(np.zeros(_n, dtype=bool))
+
+
+class Facet:
+    """Bitmap per value of one facet, plus per-title value codes for facet counts"""
+
+    def __init__(self, positions, values):
+        codes, self.values = pd.factorize(pd.Series(values, dtype=object))
+        self.values = np.asarray(self.values, dtype=object)
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.codes = codes
+        self.lookup = {fold(value): i for i, value in enumerate(self.values)}
+        self.alpha = np.argsort(np.argsort(self.values.astype(str), kind='stable'))
+
+        self.bitmaps = []
+        for i in range(len(self.values)):
+            mask = np.zeros(_n, dtype=bool)
+            mask[self.positions[codes == i]] = True
+            self.bitmaps.append(_pack(mask))
+
+    def select(self, requested):
+        """Titles having any of the requested values (unknown values match nothing)"""
+        bits = NONE
+        for value in requested:
+            i = self.lookup.get(fold(value))
+            if i is not None:
+                bits = bits | self.bitmaps[i]
+        return bits
+
+    def counts(self, mask):
+        """Matching titles per value for a boolean title mask, most common first"""
+        counts = np.bincount(self.codes[mask[self.positions]], minlength=len(self.values))
+        order = np.lexsort((self.alpha, -counts))
+        return [
+            {'value': self.values[i], 'count': int(counts[i])}
+            for i in order if counts[i] > 0
+        ]
+
+
+# ==========================================
+# INDEXES
+# ==========================================
+
+facets = {
+    'type': Facet(np.arange(_n), df['type']),
+    'rating': Facet(np.arange(_n), df['rating']),
+    'country': Facet(netflix.title_countries['pos'], netflix.title_countries['country'].astype(str)),
+    'genre': Facet(netflix.title_genres['pos'], netflix.title_genres['genre'].astype(str)),
+}
+
+# Year ranges: bitmap of titles released up to (and including) each year, so
+# year_from..year_to is upto[year_to] & ~upto[year_from - 1]
+_release_years = df['release_year'].to_numpy()
+_years = np.unique(_release_years)
+_released_upto = [_pack(_release_years <= year) for year in _years]
+
+
+def _released_by(year):
+    i = int(np.searchsorted(_years, year, side='right')) - 1
+    return _released_upto[i] if i >= 0 else NONE
+
+
+# Title orders for each sort (newest first, then by title), computed once
+_titles = df['title'].astype(str).str.lower().to_numpy()
+_added = df['date_added']
+_orders = {
+    # Titles without a date_added go last
+    'added': np.lexsort((_titles, -_added.fillna(pd.Timestamp(0)).to_numpy().astype('int64'), _added.isna().to_numpy())),
+    'release_year': np.lexsort((_titles, -_release_years)),
+    'title': np.argsort(_titles, kind='stable'),
+}
+
+
+def _records(positions):
+    """Response records for a page of title positions, built column-wise"""
+    page = df.iloc[positions]
+    added = page['date_added'].dt.strftime('%Y-%m-%d').astype(object).where(page['date_added'].notna(), None)
+    return [
+        {
+            "show_id": int(show_id),
+            "title": title,
+            "type": title_type,
+            "rating": rating,
+            "release_year": int(year),
+            "date_added": date_added,
+            "duration": duration,
+            "country": country,
+            "genres": [str(g) for g in netflix.genres_by_pos[pos]],
+        }
+        for pos, show_id, title, title_type, rating, year, date_added, duration, country in zip(
+            positions, page['show_id'], page['title'], page['type'], page['rating'],
+            page['release_year'], added, page['duration'], page['country'])
+    ]
+
+
+def browse(filters, year_from=None, year_to=None, sort='added', limit=DEFAULT_LIMIT, offset=0):
+    """Titles matching every facet filter, a page of them, and facet counts.
+
+    ``filters`` maps facet names to lists of accepted values (OR within a facet,
+    AND across facets); years are inclusive.
+    """
+    bits = ALL
+    for name, requested in filters.items():
+        if requested:
+            bits = bits & facets[name].select(requested)
+    if year_to is not None:
+        bits = bits & _released_by(year_to)
+    if year_from is not None:
+        bits = bits & ~_released_by(year_from - 1)
+
+    mask = np.unpackbits(bits, count=_n).astype(bool)
+    order = _orders[sort]
+    matched = order[mask[order]]
+
+    return {
+        "total_results": int(len(matched)),
+        "facets": {name: facet.counts(mask) for name, facet in facets.items()},
+        "titles": _records(matched[offset:offset + limit]),
+    }
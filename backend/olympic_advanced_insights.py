@@ -1,19 +1,13 @@
-import pandas as pd
 import numpy as np
 from collections import Counter, defaultdict
 import json
 import re
-import os
-
-# Load dataset (use backend/athlete_events.csv)
-data_path = os.path.join(os.path.dirname(__file__), 'athlete_events.csv')
-if os.path.exists(data_path):
-    df = pd.read_csv(data_path)
-else:
-    try:
-        df = pd.read_csv('athlete_events.csv')
-    except Exception:
-        df = pd.DataFrame()
+
+import datasets
+from olympic_tables import MEDAL_COLUMNS, medals, medals_by_noc, noc_games, noc_totals, rows_by_year
+
+# Shared dataset (loaded once by the registry)
+df = datasets.olympics()
 
 # ==========================================
 # 11. NAME ANALYSIS
@@ -120,39 +114,54 @@ def get_surname_analysis():
 # 12. COMEBACK STORIES
 # ==========================================
 
-def get_comeback_athletes():
+def get_comeback_athletes(min_gap=8, top_n=20):
     """Athletes who took breaks and returned"""
-    athlete_years = df.groupby(['ID', 'Name', 'Team'])['Year'].apply(list).reset_index()
-    
+    if df.empty:
+        return {'comeback_athletes': []}
+
+    # One group per (ID, Name, Team), numbered in groupby order; rows sorted by group then year
+    group = df.groupby(['ID', 'Name', 'Team'], observed=True).ngroup().to_numpy()
+    year = df['Year'].to_numpy()
+    order = np.lexsort((year, group))
+    group_s, year_s = group[order], year[order]
+
+    sizes = np.bincount(group_s)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    # Gap to the next appearance of the same athlete; first gap >= min_gap per athlete
+    gaps = np.diff(year_s)
+    is_gap = (group_s[1:] == group_s[:-1]) & (gaps >= min_gap) & (sizes[group_s[:-1]] >= 3)
+    gap_pos = np.flatnonzero(is_gap)
+    _, first = np.unique(group_s[gap_pos], return_index=True)
+    gap_pos = gap_pos[first]
+
+    # Longest breaks first; ties keep groupby order
+    top = gap_pos[np.argsort(-gaps[gap_pos], kind='stable')[:top_n]]
+
+    # Per-ID medal years for the shortlisted athletes only
+    rows = order[top]
+    ids = df['ID'].to_numpy()[rows]
+    medal_years = medals.loc[medals['ID'].isin(ids), ['ID', 'Year']]
+    medal_years = medal_years.groupby('ID')['Year'].apply(np.sort)
+
     comebacks = []
-    for _, row in athlete_years.iterrows():
-        years = sorted(row['Year'])
-        if len(years) >= 3:
-            # Check for gaps >= 8 years
-            for i in range(len(years) - 1):
-                gap = years[i + 1] - years[i]
-                if gap >= 8:
-                    athlete_data = df[df['ID'] == row['ID']]
-                    medals_before = athlete_data[(athlete_data['Year'] <= years[i]) & 
-                                                (athlete_data['Medal'].notna())].shape[0]
-                    medals_after = athlete_data[(athlete_data['Year'] >= years[i + 1]) & 
-                                               (athlete_data['Medal'].notna())].shape[0]
-                    
-                    comebacks.append({
-                        'id': int(row['ID']),
-                        'name': row['Name'],
-                        'team': row['Team'],
-                        'gap_years': int(gap),
-                        'years_before_break': [int(y) for y in years if y <= years[i]],
-                        'years_after_break': [int(y) for y in years if y >= years[i + 1]],
-                        'medals_before': int(medals_before),
-                        'medals_after': int(medals_after)
-                    })
-                    break
-    
-    # Sort by gap
-    comebacks = sorted(comebacks, key=lambda x: x['gap_years'], reverse=True)[:20]
-    
+    for pos, row in zip(top, rows):
+        g = group_s[pos]
+        last_before, first_after = year_s[pos], year_s[pos + 1]
+        athlete_id = int(df['ID'].iat[row])
+        won = medal_years.get(athlete_id, np.empty(0, dtype=year.dtype))
+
+        comebacks.append({
+            'id': athlete_id,
+            'name': df['Name'].iat[row],
+            'team': df['Team'].iat[row],
+            'gap_years': int(gaps[pos]),
+            'years_before_break': year_s[starts[g]:pos + 1].tolist(),
+            'years_after_break': year_s[pos + 1:starts[g] + sizes[g]].tolist(),
+            'medals_before': int(np.searchsorted(won, last_before, side='right')),
+            'medals_after': int(len(won) - np.searchsorted(won, first_after, side='left'))
+        })
+
     return {'comeback_athletes': comebacks}
 
 
@@ -162,25 +171,21 @@ def get_comeback_athletes():
 
 def get_consistent_countries(min_olympics=10):
     """Countries that consistently win medals"""
-    medals_df = df[df['Medal'].notna()].copy()
-    
-    country_years = medals_df.groupby(['NOC', 'Year']).size().reset_index()
-    country_olympics = country_years.groupby('NOC')['Year'].nunique().reset_index()
-    country_olympics.columns = ['NOC', 'Olympics_Count']
+    country_olympics = noc_games.groupby('NOC', observed=True).agg(
+        Olympics_Count=('Year', 'nunique'),
+        Total_Medals=('Total', 'sum')
+    ).reset_index()
     
     # Filter countries with minimum olympics
     consistent = country_olympics[country_olympics['Olympics_Count'] >= min_olympics]
     
     result = []
     for _, row in consistent.iterrows():
-        noc = row['NOC']
-        country_data = medals_df[medals_df['NOC'] == noc]
-        
-        total_medals = country_data.shape[0]
+        total_medals = row['Total_Medals']
         olympics_count = int(row['Olympics_Count'])
         
         result.append({
-            'country': noc,
+            'country': row['NOC'],
             'olympics_participated': olympics_count,
             'total_medals': int(total_medals),
             'avg_medals_per_olympics': round(total_medals / olympics_count, 2)
@@ -198,34 +203,28 @@ def get_consistent_countries(min_olympics=10):
 
 def get_medal_droughts():
     """Countries with long gaps between medals"""
-    medals_df = df[df['Medal'].notna()].copy()
-    
-    country_years = medals_df.groupby('NOC')['Year'].apply(sorted).reset_index()
+    # Sorted medal-winning years per country and the gap to the previous one
+    country_years = noc_games.groupby(['NOC', 'Year'], observed=True).size().reset_index()
+    country_years['Gap'] = country_years.groupby('NOC', observed=True)['Year'].diff()
+    gaps = country_years.dropna(subset=['Gap'])
     
-    droughts = []
-    for _, row in country_years.iterrows():
-        years = row['Year']
-        if len(years) >= 2:
-            max_gap = 0
-            gap_period = None
-            
-            for i in range(len(years) - 1):
-                gap = years[i + 1] - years[i]
-                if gap > max_gap:
-                    max_gap = gap
-                    gap_period = (years[i], years[i + 1])
-            
-            if max_gap >= 12:  # At least 12 years gap
-                droughts.append({
-                    'country': row['NOC'],
-                    'drought_years': int(max_gap),
-                    'from_year': int(gap_period[0]),
-                    'to_year': int(gap_period[1]),
-                    'total_medals_all_time': len(years)
-                })
+    # Longest gap per country (the earliest one on ties)
+    longest = gaps.loc[gaps.groupby('NOC', observed=True)['Gap'].idxmax()]
+    longest = longest[longest['Gap'] >= 12]  # At least 12 years gap
     
     # Sort by drought length
-    droughts = sorted(droughts, key=lambda x: x['drought_years'], reverse=True)[:30]
+    longest = longest.sort_values('Gap', ascending=False, kind='stable').head(30)
+    total_medals = noc_totals.set_index('NOC')['Total']
+    
+    droughts = []
+    for _, row in longest.iterrows():
+        droughts.append({
+            'country': row['NOC'],
+            'drought_years': int(row['Gap']),
+            'from_year': int(row['Year'] - row['Gap']),
+            'to_year': int(row['Year']),
+            'total_medals_all_time': int(total_medals[row['NOC']])
+        })
     
     return {'medal_droughts': droughts}
 
@@ -236,13 +235,11 @@ def get_medal_droughts():
 
 def get_gold_rush_moments(threshold=20):
     """Sudden spike in medals for a country"""
-    medals_df = df[df['Medal'].notna()].copy()
-    
-    country_year_medals = medals_df.groupby(['NOC', 'Year']).size().reset_index()
+    country_year_medals = noc_games.groupby(['NOC', 'Year'], observed=True)['Total'].sum().reset_index()
     country_year_medals.columns = ['NOC', 'Year', 'Medals']
     
     # Calculate average for each country
-    country_avg = country_year_medals.groupby('NOC')['Medals'].mean().reset_index()
+    country_avg = country_year_medals.groupby('NOC', observed=True)['Medals'].mean().reset_index()
     country_avg.columns = ['NOC', 'Avg_Medals']
     
     # Merge and find spikes
@@ -269,35 +266,36 @@ def get_gold_rush_moments(threshold=20):
 # 16. ONE-HIT WONDERS
 # ==========================================
 
-def get_one_hit_wonders():
+def get_one_hit_wonders(top_n=50):
     """Athletes who participated once and won medal"""
-    athlete_olympics = df.groupby('ID')['Games'].nunique().reset_index()
-    athlete_olympics.columns = ['ID', 'Olympics_Count']
-    
-    one_timers = athlete_olympics[athlete_olympics['Olympics_Count'] == 1]['ID'].tolist()
-    
-    medalists = df[(df['ID'].isin(one_timers)) & (df['Medal'].notna())]
-    
+    athlete_olympics = df.groupby('ID')['Games'].nunique()
+    one_timers = athlete_olympics.index[athlete_olympics == 1]
+
+    medalists = medals[medals['ID'].isin(one_timers)]
+
+    # One row per athlete (first medal row, in appearance order) with a medal breakdown
+    counts = medalists.groupby(['ID', 'Medal'], observed=True).size().unstack('Medal', fill_value=0)
+    counts = counts.reindex(columns=MEDAL_COLUMNS, fill_value=0)
+    athletes = medalists.drop_duplicates('ID').join(counts, on='ID')
+    athletes['Total'] = athletes[MEDAL_COLUMNS].sum(axis=1)
+
+    # Partial sort: most medals first, ties keep appearance order
+    top = athletes.nlargest(top_n, 'Total', keep='first')
+
     result = []
-    for athlete_id in medalists['ID'].unique():
-        athlete_data = medalists[medalists['ID'] == athlete_id]
-        medals = athlete_data['Medal'].value_counts().to_dict()
-        
+    for _, row in top.iterrows():
         result.append({
-            'id': int(athlete_id),
-            'name': athlete_data.iloc[0]['Name'],
-            'team': athlete_data.iloc[0]['Team'],
-            'year': int(athlete_data.iloc[0]['Year']),
-            'sport': athlete_data.iloc[0]['Sport'],
-            'gold': medals.get('Gold', 0),
-            'silver': medals.get('Silver', 0),
-            'bronze': medals.get('Bronze', 0),
-            'total_medals': len(athlete_data)
+            'id': int(row['ID']),
+            'name': row['Name'],
+            'team': row['Team'],
+            'year': int(row['Year']),
+            'sport': row['Sport'],
+            'gold': int(row['Gold']),
+            'silver': int(row['Silver']),
+            'bronze': int(row['Bronze']),
+            'total_medals': int(row['Total'])
         })
-    
-    # Sort by total medals
-    result = sorted(result, key=lambda x: x['total_medals'], reverse=True)[:50]
-    
+
     return {'one_hit_wonders': result}
 
 
@@ -307,11 +305,9 @@ def get_one_hit_wonders():
 
 def get_gender_parity_by_country(year=None):
     """Gender balance in each country"""
-    df_filtered = df.copy()
-    if year:
-        df_filtered = df_filtered[df_filtered['Year'] == year]
+    df_filtered = rows_by_year.rows(year) if year else df
     
-    gender_counts = df_filtered.groupby(['NOC', 'Sex']).size().unstack(fill_value=0)
+    gender_counts = df_filtered.groupby(['NOC', 'Sex'], observed=True).size().unstack(fill_value=0)
     gender_counts['Total'] = gender_counts.sum(axis=1)
     gender_counts['Female_Percentage'] = (gender_counts.get('F', 0) / gender_counts['Total']) * 100
     gender_counts['Parity_Score'] = 100 - abs(50 - gender_counts['Female_Percentage'])
@@ -334,7 +330,7 @@ def get_gender_parity_by_country(year=None):
 
 def get_gender_parity_by_sport():
     """Gender balance in each sport"""
-    gender_counts = df.groupby(['Sport', 'Sex']).size().unstack(fill_value=0)
+    gender_counts = df.groupby(['Sport', 'Sex'], observed=True).size().unstack(fill_value=0)
     gender_counts['Total'] = gender_counts.sum(axis=1)
     gender_counts['Female_Percentage'] = (gender_counts.get('F', 0) / gender_counts['Total']) * 100
     
@@ -360,8 +356,8 @@ def get_gender_parity_by_sport():
 
 def get_small_country_success():
     """Countries with less athletes but good medals"""
-    total_athletes = df.groupby('NOC')['ID'].nunique().reset_index()
-    total_medals = df[df['Medal'].notna()].groupby('NOC').size().reset_index()
+    total_athletes = df.groupby('NOC', observed=True)['ID'].nunique().reset_index()
+    total_medals = noc_totals[['NOC', 'Total']]
     
     total_athletes.columns = ['NOC', 'Athletes']
     total_medals.columns = ['NOC', 'Medals']
@@ -389,30 +385,34 @@ def get_small_country_success():
 
 def get_seasonal_crossover_athletes():
     """Athletes who competed in both Summer and Winter"""
-    athlete_seasons = df.groupby('ID')['Season'].unique().reset_index()
-    
-    crossover = athlete_seasons[athlete_seasons['Season'].apply(lambda x: len(x) > 1)]
-    
+    seasons = df.groupby('ID')['Season'].nunique()
+    athletes = df[df['ID'].isin(seasons.index[seasons > 1])]
+
+    # Per-athlete summaries in one grouped pass (rows keep their original order)
+    first = athletes.drop_duplicates('ID').set_index('ID')
+    sports = (
+        athletes.drop_duplicates(['ID', 'Season', 'Sport'])
+        .groupby(['ID', 'Season'], observed=True)['Sport']
+        .agg(list)
+    )
+    summary = athletes.groupby('ID').agg(
+        Medals=('Medal', 'count'),
+        First_Year=('Year', 'min'),
+        Last_Year=('Year', 'max')
+    )
+
     result = []
-    for _, row in crossover.iterrows():
-        athlete_id = row['ID']
-        athlete_data = df[df['ID'] == athlete_id]
-        
-        summer_sports = athlete_data[athlete_data['Season'] == 'Summer']['Sport'].unique().tolist()
-        winter_sports = athlete_data[athlete_data['Season'] == 'Winter']['Sport'].unique().tolist()
-        
-        medals = athlete_data[athlete_data['Medal'].notna()]
-        
+    for athlete_id, row in summary.iterrows():
         result.append({
             'id': int(athlete_id),
-            'name': athlete_data.iloc[0]['Name'],
-            'team': athlete_data.iloc[0]['Team'],
-            'summer_sports': summer_sports,
-            'winter_sports': winter_sports,
-            'total_medals': len(medals),
-            'years_active': athlete_data['Year'].min() + ' - ' + str(athlete_data['Year'].max())
+            'name': first.at[athlete_id, 'Name'],
+            'team': first.at[athlete_id, 'Team'],
+            'summer_sports': sports.get((athlete_id, 'Summer'), []),
+            'winter_sports': sports.get((athlete_id, 'Winter'), []),
+            'total_medals': int(row['Medals']),
+            'years_active': f"{int(row['First_Year'])} - {int(row['Last_Year'])}"
         })
-    
+
     return {'crossover_athletes': result}
 
 
@@ -422,9 +422,9 @@ def get_seasonal_crossover_athletes():
 
 def get_age_sweet_spot_by_sport():
     """Optimal age for winning medals in each sport"""
-    medals_df = df[(df['Medal'].notna()) & (df['Age'].notna())].copy()
+    medals_df = medals[medals['Age'].notna()]
     
-    sport_age = medals_df.groupby('Sport')['Age'].agg(['mean', 'median', 'std']).reset_index()
+    sport_age = medals_df.groupby('Sport', observed=True)['Age'].agg(['mean', 'median', 'std']).reset_index()
     
     result = []
     for _, row in sport_age.iterrows():
@@ -445,10 +445,8 @@ def get_age_sweet_spot_by_sport():
 
 def get_first_time_medal_winners(year):
     """Countries winning their first medal in a specific year"""
-    medals_df = df[df['Medal'].notna()].copy()
-    
     # Get all countries' first medal year
-    first_medal_year = medals_df.groupby('NOC')['Year'].min().reset_index()
+    first_medal_year = noc_games.groupby('NOC', observed=True)['Year'].min().reset_index()
     first_medal_year.columns = ['NOC', 'First_Medal_Year']
     
     # Filter for specific year
@@ -457,7 +455,8 @@ def get_first_time_medal_winners(year):
     result = []
     for _, row in first_timers.iterrows():
         noc = row['NOC']
-        country_data = medals_df[(medals_df['NOC'] == noc) & (medals_df['Year'] == year)]
+        country_data = medals_by_noc.rows(noc)
+        country_data = country_data[country_data['Year'] == year]
         
         result.append({
             'country': noc,
@@ -476,8 +475,8 @@ def get_first_time_medal_winners(year):
 
 def get_dropout_rate_by_sport():
     """Athletes who participated but didn't win medals (high failure rate sports)"""
-    total_participants = df.groupby('Sport')['ID'].nunique().reset_index()
-    medalists = df[df['Medal'].notna()].groupby('Sport')['ID'].nunique().reset_index()
+    total_participants = df.groupby('Sport', observed=True)['ID'].nunique().reset_index()
+    medalists = medals.groupby('Sport', observed=True)['ID'].nunique().reset_index()
     
     total_participants.columns = ['Sport', 'Total_Athletes']
     medalists.columns = ['Sport', 'Medalists']
@@ -2,17 +2,15 @@ import pandas as pd
 import numpy as np
 from collections import Counter
 import json
-import os
-
-# Load the dataset (use backend/athlete_events.csv)
-data_path = os.path.join(os.path.dirname(__file__), 'athlete_events.csv')
-if os.path.exists(data_path):
-    df = pd.read_csv(data_path)
-else:
-    try:
-        df = pd.read_csv('athlete_events.csv')
-    except Exception:
-        df = pd.DataFrame()
+
+import datasets
+from olympic_tables import (
+    medals, medal_facts, noc_games, noc_totals, athlete_medals,
+    rows_by_id, rows_by_sport, rows_by_year, rows_by_games, noc_games_by_noc, medal_facts_by_sport
+)
+
+# Shared dataset (loaded once by the registry)
+df = datasets.olympics()
 
 # ==========================================
 # 1. MEDAL TALLY & COUNTRY PERFORMANCE
@@ -20,19 +18,16 @@ else:
 
 def get_top_countries_alltime(top_n=10):
     """Top performing countries of all time"""
-    medals_df = df[df['Medal'].notna()].copy()
-    
-    country_medals = medals_df.groupby(['NOC', 'Medal']).size().unstack(fill_value=0)
-    country_medals['Total'] = country_medals.sum(axis=1)
+    country_medals = noc_totals.set_index('NOC')
     country_medals = country_medals.sort_values('Total', ascending=False).head(top_n)
     
     result = []
     for noc in country_medals.index:
         result.append({
             'country': noc,
-            'gold': int(country_medals.loc[noc, 'Gold']) if 'Gold' in country_medals.columns else 0,
-            'silver': int(country_medals.loc[noc, 'Silver']) if 'Silver' in country_medals.columns else 0,
-            'bronze': int(country_medals.loc[noc, 'Bronze']) if 'Bronze' in country_medals.columns else 0,
+            'gold': int(country_medals.loc[noc, 'Gold']),
+            'silver': int(country_medals.loc[noc, 'Silver']),
+            'bronze': int(country_medals.loc[noc, 'Bronze']),
             'total': int(country_medals.loc[noc, 'Total'])
         })
     
@@ -41,25 +36,24 @@ def get_top_countries_alltime(top_n=10):
 
 def get_country_medals_by_year(noc, year=None):
     """Country-wise medal count for specific year or all years"""
-    medals_df = df[df['Medal'].notna()].copy()
+    country_data = noc_games_by_noc.rows(noc)
     
     if year:
-        medals_df = medals_df[medals_df['Year'] == year]
-    
-    country_data = medals_df[medals_df['NOC'] == noc]
+        country_data = country_data[country_data['Year'] == year]
     
     if country_data.empty:
         return {'error': f'No data found for {noc}'}
     
-    medals_by_year = country_data.groupby(['Year', 'Medal']).size().unstack(fill_value=0)
+    # Summer and Winter Games of the same year are reported together
+    medals_by_year = country_data.groupby('Year')[['Gold', 'Silver', 'Bronze']].sum()
     
     result = []
     for yr in medals_by_year.index:
         result.append({
             'year': int(yr),
-            'gold': int(medals_by_year.loc[yr, 'Gold']) if 'Gold' in medals_by_year.columns else 0,
-            'silver': int(medals_by_year.loc[yr, 'Silver']) if 'Silver' in medals_by_year.columns else 0,
-            'bronze': int(medals_by_year.loc[yr, 'Bronze']) if 'Bronze' in medals_by_year.columns else 0,
+            'gold': int(medals_by_year.loc[yr, 'Gold']),
+            'silver': int(medals_by_year.loc[yr, 'Silver']),
+            'bronze': int(medals_by_year.loc[yr, 'Bronze']),
         })
     
     return {'country': noc, 'medals_by_year': result}
@@ -67,12 +61,8 @@ def get_country_medals_by_year(noc, year=None):
 
 def get_country_ranking(year, season='Summer'):
     """Country ranking for a specific Olympics"""
-    medals_df = df[(df['Medal'].notna()) & (df['Year'] == year) & (df['Season'] == season)].copy()
-    
-    country_medals = medals_df.groupby(['NOC', 'Medal']).size().unstack(fill_value=0)
-    country_medals['Total'] = country_medals.sum(axis=1)
-    country_medals['Gold'] = country_medals.get('Gold', 0)
-    country_medals = country_medals.sort_values(['Gold', 'Total'], ascending=False)
+    country_medals = noc_games[(noc_games['Year'] == year) & (noc_games['Season'] == season)]
+    country_medals = country_medals.set_index('NOC').sort_values(['Gold', 'Total'], ascending=False)
     
     result = []
     for rank, noc in enumerate(country_medals.index, 1):
@@ -80,8 +70,8 @@ def get_country_ranking(year, season='Summer'):
             'rank': rank,
             'country': noc,
             'gold': int(country_medals.loc[noc, 'Gold']),
-            'silver': int(country_medals.loc[noc, 'Silver']) if 'Silver' in country_medals.columns else 0,
-            'bronze': int(country_medals.loc[noc, 'Bronze']) if 'Bronze' in country_medals.columns else 0,
+            'silver': int(country_medals.loc[noc, 'Silver']),
+            'bronze': int(country_medals.loc[noc, 'Bronze']),
             'total': int(country_medals.loc[noc, 'Total'])
         })
     
@@ -94,30 +84,19 @@ def get_country_ranking(year, season='Summer'):
 
 def get_most_decorated_athletes(top_n=10):
     """Athletes with most medals"""
-    medals_df = df[df['Medal'].notna()].copy()
+    top_athletes = athlete_medals.nlargest(top_n, 'Total', keep='first')
     
-    athlete_medals = medals_df.groupby(['ID', 'Name', 'Sex', 'Team']).agg({
-        'Medal': 'count',
-    }).reset_index()
-    
-    athlete_medals.columns = ['ID', 'Name', 'Sex', 'Team', 'Total_Medals']
-    athlete_medals = athlete_medals.sort_values('Total_Medals', ascending=False).head(top_n)
-    
-    # Get medal breakdown
     result = []
-    for _, row in athlete_medals.iterrows():
-        athlete_id = row['ID']
-        medals = medals_df[medals_df['ID'] == athlete_id]['Medal'].value_counts().to_dict()
-        
+    for _, row in top_athletes.iterrows():
         result.append({
             'id': int(row['ID']),
             'name': row['Name'],
             'sex': row['Sex'],
             'team': row['Team'],
-            'total_medals': int(row['Total_Medals']),
-            'gold': medals.get('Gold', 0),
-            'silver': medals.get('Silver', 0),
-            'bronze': medals.get('Bronze', 0)
+            'total_medals': int(row['Total']),
+            'gold': int(row['Gold']),
+            'silver': int(row['Silver']),
+            'bronze': int(row['Bronze'])
         })
     
     return {'most_decorated_athletes': result}
@@ -125,12 +104,10 @@ def get_most_decorated_athletes(top_n=10):
 
 def get_physical_stats_by_sport(sport=None):
     """Average physical stats by sport"""
-    stats_df = df[df[['Age', 'Height', 'Weight']].notna().all(axis=1)].copy()
+    stats_df = rows_by_sport.rows(sport) if sport else df
+    stats_df = stats_df[stats_df[['Age', 'Height', 'Weight']].notna().all(axis=1)]
     
-    if sport:
-        stats_df = stats_df[stats_df['Sport'] == sport]
-    
-    grouped = stats_df.groupby('Sport').agg({
+    grouped = stats_df.groupby('Sport', observed=True).agg({
         'Age': ['mean', 'min', 'max'],
         'Height': ['mean', 'min', 'max'],
         'Weight': ['mean', 'min', 'max'],
@@ -140,7 +117,7 @@ def get_physical_stats_by_sport(sport=None):
     result = []
     for _, row in grouped.iterrows():
         result.append({
-            'sport': row['Sport'],
+            'sport': row[('Sport', '')],
             'avg_age': round(row['Age']['mean'], 2),
             'min_age': int(row['Age']['min']),
             'max_age': int(row['Age']['max']),
@@ -158,7 +135,7 @@ def get_physical_stats_by_sport(sport=None):
 
 def get_youngest_oldest_medalists():
     """Youngest and oldest medal winners"""
-    medals_df = df[(df['Medal'].notna()) & (df['Age'].notna())].copy()
+    medals_df = medals[medals['Age'].notna()]
     
     youngest = medals_df.nsmallest(10, 'Age')[['Name', 'Age', 'Sport', 'Event', 'Year', 'Medal']]
     oldest = medals_df.nlargest(10, 'Age')[['Name', 'Age', 'Sport', 'Event', 'Year', 'Medal']]
@@ -177,9 +154,9 @@ def get_youngest_oldest_medalists():
 
 def get_dominant_countries_per_sport(sport):
     """Which country dominates which sport"""
-    medals_df = df[(df['Medal'].notna()) & (df['Sport'] == sport)].copy()
+    sport_facts = medal_facts_by_sport.rows(sport)
     
-    country_medals = medals_df.groupby('NOC').size().sort_values(ascending=False).head(10)
+    country_medals = sport_facts.groupby('NOC', observed=True)['Count'].sum().sort_values(ascending=False).head(10)
     
     result = []
     for noc, count in country_medals.items():
@@ -217,7 +194,7 @@ def get_sport_evolution():
 
 def get_participation_count_by_sport():
     """Number of athletes per sport"""
-    participation = df.groupby('Sport')['ID'].nunique().sort_values(ascending=False)
+    participation = df.groupby('Sport', observed=True)['ID'].nunique().sort_values(ascending=False)
     
     result = []
     for sport, count in participation.items():
@@ -235,7 +212,7 @@ def get_participation_count_by_sport():
 
 def get_gender_participation_trend():
     """Male vs Female participation over time"""
-    gender_trend = df.groupby(['Year', 'Sex']).size().unstack(fill_value=0)
+    gender_trend = df.groupby(['Year', 'Sex'], observed=True).size().unstack(fill_value=0)
     
     result = []
     for year in gender_trend.index:
@@ -274,7 +251,7 @@ def get_country_participation_growth():
 
 def get_host_cities_list():
     """List of all host cities"""
-    host_data = df.groupby(['Year', 'Season', 'City']).size().reset_index()
+    host_data = df.groupby(['Year', 'Season', 'City'], observed=True).size().reset_index()
     host_data = host_data.drop(columns=0)
     
     result = []
@@ -290,7 +267,7 @@ def get_host_cities_list():
 
 def get_summer_vs_winter_comparison():
     """Summer vs Winter Olympics comparison"""
-    season_stats = df.groupby('Season').agg({
+    season_stats = df.groupby('Season', observed=True).agg({
         'ID': 'nunique',
         'NOC': 'nunique',
         'Sport': 'nunique',
@@ -316,7 +293,8 @@ def get_summer_vs_winter_comparison():
 
 def get_physical_changes_over_time(sport):
     """How athlete body types changed over time"""
-    stats_df = df[(df['Sport'] == sport) & df[['Age', 'Height', 'Weight']].notna().all(axis=1)].copy()
+    stats_df = rows_by_sport.rows(sport)
+    stats_df = stats_df[stats_df[['Age', 'Height', 'Weight']].notna().all(axis=1)].copy()
     
     # Group by decades
     stats_df['Decade'] = (stats_df['Year'] // 10) * 10
@@ -344,9 +322,9 @@ def get_physical_changes_over_time(sport):
 def get_bmi_analysis_by_sport():
     """BMI analysis for each sport"""
     stats_df = df[df[['Height', 'Weight']].notna().all(axis=1)].copy()
-    stats_df['BMI'] = stats_df['Weight'] / ((stats_df['Height'] / 100) ** 2)
+    stats_df['BMI'] = stats_df['Weight'].astype('float64') / ((stats_df['Height'].astype('float64') / 100) ** 2)
     
-    bmi_stats = stats_df.groupby('Sport')['BMI'].agg(['mean', 'min', 'max']).reset_index()
+    bmi_stats = stats_df.groupby('Sport', observed=True)['BMI'].agg(['mean', 'min', 'max']).reset_index()
     
     result = []
     for _, row in bmi_stats.iterrows():
@@ -369,10 +347,11 @@ def get_bmi_analysis_by_sport():
 
 def get_medal_conversion_rate(year, season='Summer'):
     """Medal conversion rate: Medals per participant"""
-    year_df = df[(df['Year'] == year) & (df['Season'] == season)].copy()
+    year_df = rows_by_games.rows((year, season))
     
-    total_participants = year_df.groupby('NOC')['ID'].nunique()
-    medals_won = year_df[year_df['Medal'].notna()].groupby('NOC').size()
+    total_participants = year_df.groupby('NOC', observed=True)['ID'].nunique()
+    games_medals = noc_games[(noc_games['Year'] == year) & (noc_games['Season'] == season)]
+    medals_won = games_medals.set_index('NOC')['Total']
     
     conversion = pd.DataFrame({
         'participants': total_participants,
@@ -396,8 +375,8 @@ def get_medal_conversion_rate(year, season='Summer'):
 
 def get_underdog_nations():
     """Small countries with high medal efficiency"""
-    total_participants = df.groupby('NOC')['ID'].nunique()
-    medals_won = df[df['Medal'].notna()].groupby('NOC').size()
+    total_participants = df.groupby('NOC', observed=True)['ID'].nunique()
+    medals_won = noc_totals.set_index('NOC')['Total']
     
     efficiency = pd.DataFrame({
         'participants': total_participants,
@@ -427,13 +406,12 @@ def get_underdog_nations():
 
 def get_most_experienced_athletes():
     """Athletes who participated in most Olympics"""
-    olympic_count = df.groupby(['ID', 'Name', 'Team', 'Sex'])['Games'].nunique().reset_index()
+    olympic_count = df.groupby(['ID', 'Name', 'Team', 'Sex'], observed=True)['Games'].nunique().reset_index()
     olympic_count = olympic_count.sort_values('Games', ascending=False).head(20)
     
     result = []
     for _, row in olympic_count.iterrows():
-        athlete_data = df[df['ID'] == row['ID']]
-        years = sorted(athlete_data['Year'].unique())
+        years = sorted(rows_by_id.rows(row['ID'])['Year'].unique())
         
         result.append({
             'id': int(row['ID']),
@@ -450,7 +428,7 @@ def get_most_experienced_athletes():
 
 def get_age_defying_athletes():
     """Athletes who won medals at advanced age"""
-    medals_df = df[(df['Medal'].notna()) & (df['Age'].notna())].copy()
+    medals_df = medals[medals['Age'].notna()]
     
     # Athletes over 40 with medals
     old_medalists = medals_df[medals_df['Age'] >= 40].sort_values('Age', ascending=False)
@@ -476,27 +454,26 @@ def get_age_defying_athletes():
 
 def get_sport_monopoly():
     """Sports dominated by single country"""
-    medals_df = df[df['Medal'].notna()].copy()
+    sport_country = medal_facts.groupby(['Sport', 'NOC'], observed=True)['Count'].sum().reset_index()
+    sport_totals = sport_country.groupby('Sport', observed=True)['Count'].sum()
+    
+    # Top country per sport (ties go to the alphabetically first NOC)
+    top_countries = sport_country.sort_values('Count', ascending=False, kind='stable').drop_duplicates('Sport')
     
     result = []
-    for sport in medals_df['Sport'].unique():
-        sport_medals = medals_df[medals_df['Sport'] == sport]
-        country_medals = sport_medals['NOC'].value_counts()
+    for _, row in top_countries.iterrows():
+        top_medals = row['Count']
+        total_medals = sport_totals[row['Sport']]
+        dominance_percentage = (top_medals / total_medals) * 100
         
-        if len(country_medals) > 0:
-            top_country = country_medals.index[0]
-            top_medals = country_medals.iloc[0]
-            total_medals = country_medals.sum()
-            dominance_percentage = (top_medals / total_medals) * 100
-            
-            if dominance_percentage > 30:  # At least 30% dominance
-                result.append({
-                    'sport': sport,
-                    'dominant_country': top_country,
-                    'medals': int(top_medals),
-                    'total_sport_medals': int(total_medals),
-                    'dominance_percentage': round(dominance_percentage, 2)
-                })
+        if dominance_percentage > 30:  # At least 30% dominance
+            result.append({
+                'sport': row['Sport'],
+                'dominant_country': row['NOC'],
+                'medals': int(top_medals),
+                'total_sport_medals': int(total_medals),
+                'dominance_percentage': round(dominance_percentage, 2)
+            })
     
     # Sort by dominance
     result = sorted(result, key=lambda x: x['dominance_percentage'], reverse=True)
@@ -507,14 +484,14 @@ def get_sport_monopoly():
 def get_extinct_sports():
     """Sports that are no longer in Olympics"""
     recent_year = df['Year'].max()
-    recent_sports = set(df[df['Year'] == recent_year]['Sport'].unique())
+    recent_sports = set(rows_by_year.rows(recent_year)['Sport'].unique())
     all_sports = set(df['Sport'].unique())
     
     extinct = all_sports - recent_sports
     
     result = []
     for sport in extinct:
-        sport_data = df[df['Sport'] == sport]
+        sport_data = rows_by_sport.rows(sport)
         last_year = sport_data['Year'].max()
         first_year = sport_data['Year'].min()
         
@@ -532,35 +509,75 @@ def get_extinct_sports():
 # 10. GEOPOLITICAL INSIGHTS
 # ==========================================
 
-def get_home_advantage_analysis():
-    """Do host countries win more medals?"""
-    host_info = df.groupby(['Year', 'Season', 'City']).first()['NOC'].reset_index()
-    host_info.columns = ['Year', 'Season', 'City', 'Host_NOC']
-    
+# Host city -> host NOC (the country that organised the Games, not its athletes' team)
+HOST_CITY_NOC = {
+    'Athina': 'GRE',
+    'Paris': 'FRA', 'Chamonix': 'FRA', 'Grenoble': 'FRA', 'Albertville': 'FRA',
+    'London': 'GBR',
+    'St. Louis': 'USA', 'Los Angeles': 'USA', 'Lake Placid': 'USA', 'Squaw Valley': 'USA',
+    'Atlanta': 'USA', 'Salt Lake City': 'USA',
+    'Stockholm': 'SWE',
+    'Antwerpen': 'BEL',
+    'Amsterdam': 'NED',
+    'Berlin': 'GER', 'Garmisch-Partenkirchen': 'GER',
+    'Munich': 'FRG',
+    'Helsinki': 'FIN',
+    'Melbourne': 'AUS', 'Sydney': 'AUS',
+    'Roma': 'ITA', "Cortina d'Ampezzo": 'ITA', 'Cortina': 'ITA', 'Torino': 'ITA',
+    'Tokyo': 'JPN', 'Sapporo': 'JPN', 'Nagano': 'JPN',
+    'Mexico City': 'MEX',
+    'Montreal': 'CAN', 'Calgary': 'CAN', 'Vancouver': 'CAN',
+    'Moskva': 'URS',
+    'Sarajevo': 'YUG',
+    'Seoul': 'KOR',
+    'Barcelona': 'ESP',
+    'Beijing': 'CHN',
+    'Sochi': 'RUS',
+    'Rio de Janeiro': 'BRA',
+    'Sankt Moritz': 'SUI',
+    'Oslo': 'NOR', 'Lillehammer': 'NOR',
+    'Innsbruck': 'AUT',
+}
+
+
+def get_home_advantage_analysis(host_nocs=None):
+    """Do host countries win more medals?
+
+    ``host_nocs`` maps host city to NOC and defaults to ``HOST_CITY_NOC``.
+    """
+    host_nocs = HOST_CITY_NOC if host_nocs is None else host_nocs
+
+    games = df.groupby(['Year', 'Season', 'City'], observed=True).size().index.to_frame(index=False)
+    games['Year'] = games['Year'].astype(int)
+    games['Season'] = games['Season'].astype(str)
+    games['City'] = games['City'].astype(str)
+    games['Host_NOC'] = games['City'].map(host_nocs)
+
+    # Medal counts per Games and per (Games, NOC) from the precomputed rollup
+    per_noc = noc_games[['Year', 'Season', 'NOC', 'Total']].astype({'Year': int, 'Season': str, 'NOC': str})
+    totals = per_noc.groupby(['Year', 'Season'])['Total'].sum().rename('Games_Total').reset_index()
+
+    games = games.merge(totals, on=['Year', 'Season'], how='left')
+    games = games.merge(per_noc.rename(columns={'NOC': 'Host_NOC', 'Total': 'Host_Total'}),
+                        on=['Year', 'Season', 'Host_NOC'], how='left')
+    games[['Games_Total', 'Host_Total']] = games[['Games_Total', 'Host_Total']].fillna(0)
+
     result = []
-    for _, row in host_info.iterrows():
-        year = row['Year']
-        season = row['Season']
-        host_noc = row['Host_NOC']
-        
-        # Medals won by host
-        host_medals = df[(df['Year'] == year) & (df['Season'] == season) & 
-                        (df['NOC'] == host_noc) & (df['Medal'].notna())].shape[0]
-        
-        # Total medals
-        total_medals = df[(df['Year'] == year) & (df['Season'] == season) & 
-                         (df['Medal'].notna())].shape[0]
-        
+    for _, row in games.iterrows():
+        host_noc = row['Host_NOC'] if pd.notna(row['Host_NOC']) else None
+        host_medals = int(row['Host_Total'])
+        total_medals = int(row['Games_Total'])
+
         result.append({
-            'year': int(year),
-            'season': season,
+            'year': int(row['Year']),
+            'season': row['Season'],
             'city': row['City'],
             'host_country': host_noc,
-            'medals_won': int(host_medals),
-            'total_medals': int(total_medals),
+            'medals_won': host_medals,
+            'total_medals': total_medals,
             'percentage': round((host_medals / total_medals * 100), 2) if total_medals > 0 else 0
         })
-    
+
     return {'home_advantage': result}
 
 
@@ -570,9 +587,9 @@ def get_boycott_impact():
     
     result = []
     for year in boycott_years:
-        year_data = df[(df['Year'] == year) & (df['Medal'].notna())]
+        year_facts = medal_facts[medal_facts['Year'] == year]
         
-        top_countries = year_data['NOC'].value_counts().head(10)
+        top_countries = year_facts.groupby('NOC', observed=True)['Count'].sum().sort_values(ascending=False).head(10)
         
         countries = []
         for noc, count in top_countries.items():
@@ -583,7 +600,7 @@ def get_boycott_impact():
         
         result.append({
             'year': year,
-            'participating_countries': int(df[df['Year'] == year]['NOC'].nunique()),
+            'participating_countries': int(rows_by_year.rows(year)['NOC'].nunique()),
             'top_performers': countries
         })
     
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+import datasets
+
+# Precomputed medal tables shared by the olympic modules.
+# Built once at import; treat them as read-only (filter, never assign).
+
+MEDAL_COLUMNS = ['Gold', 'Silver', 'Bronze']
+
+df = datasets.olympics()
+if df.empty:
+    # Keep the tables buildable when athlete_events.csv is missing
+    df = pd.DataFrame(columns=['ID', 'Name', 'Sex', 'Age', 'Height', 'Weight', 'Team', 'NOC',
+                               'Games', 'Year', 'Season', 'City', 'Sport', 'Event', 'Medal'])
+
+
+def _medal_pivot(counts):
+    """Turn medal counts indexed by (..., Medal) into Gold/Silver/Bronze/Total columns"""
+    counts = counts.unstack('Medal', fill_value=0)
+    counts = counts.reindex(columns=MEDAL_COLUMNS, fill_value=0)
+    counts.columns = list(MEDAL_COLUMNS)
+    counts['Total'] = counts[MEDAL_COLUMNS].sum(axis=1)
+    return counts.reset_index()
+
+
+# ==========================================
+# MEDAL ROWS & FACT TABLE
+# ==========================================
+
+# Medal-winning rows only (a filtered view of the shared frame, not a copy per request)
+medals = df[df['Medal'].notna()]
+
+# NOC x Year x Season x Sport x Event x Medal -> Count
+medal_facts = (
+    medals.groupby(['NOC', 'Year', 'Season', 'Sport', 'Event', 'Medal'], observed=True)
+    .size()
+    .reset_index(name='Count')
+)
+
+# ==========================================
+# ROLLUPS
+# ==========================================
+
+# One row per NOC and Games: NOC, Year, Season, Gold, Silver, Bronze, Total
+noc_games = _medal_pivot(
+    medal_facts.groupby(['NOC', 'Year', 'Season', 'Medal'], observed=True)['Count'].sum()
+)
+
+# One row per NOC: NOC, Gold, Silver, Bronze, Total
+noc_totals = noc_games.groupby('NOC', observed=True)[MEDAL_COLUMNS + ['Total']].sum().reset_index()
+
+# One row per athlete (and team): ID, Name, Sex, Team, Gold, Silver, Bronze, Total
+athlete_medals = _medal_pivot(
+    medals.groupby(['ID', 'Name', 'Sex', 'Team', 'Medal'], observed=True).size()
+)
+
+
+# ==========================================
+# ROW INDEXES
+# ==========================================
+
+class RowIndex:
+    """Row positions of a frame grouped by key, for lookups without a full scan.
+
+    Positions are stored CSR-style: one argsort of the group codes plus an
+    offsets array, so each key maps to a contiguous slice.
+    """
+
+    def __init__(self, frame, columns):
+        self.frame = frame
+        grouped = frame.groupby(columns, observed=True)
+        self.keys = grouped.size().index
+        codes = grouped.ngroup().to_numpy()
+        # Rows with a missing key get code -1 and are left out
+        positions = np.flatnonzero(codes >= 0)
+        codes = codes[positions]
+        self.order = positions[np.argsort(codes, kind='stable')]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(self.keys)))))
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def positions(self, key):
+        """Row positions for ``key`` in original order (empty if unknown)"""
+        try:
+            i = self.keys.get_loc(key)
+        except (KeyError, TypeError):
+            return self.order[:0]
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def rows(self, key):
+        """Rows of the frame for ``key``"""
+        return self.frame.iloc[self.positions(key)]
+
+
+# Athlete events by entity
+rows_by_id = RowIndex(df, 'ID')
+rows_by_sport = RowIndex(df, 'Sport')
+rows_by_year = RowIndex(df, 'Year')
+rows_by_games = RowIndex(df, ['Year', 'Season'])
+
+# Medal tables by entity
+medals_by_noc = RowIndex(medals, 'NOC')
+noc_games_by_noc = RowIndex(noc_games, 'NOC')
+medal_facts_by_sport = RowIndex(medal_facts, 'Sport')
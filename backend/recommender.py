@@ -0,0 +1,162 @@
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+
+import datasets
+import netflix
+from text_index import fold
+
+# "More like this" for Netflix titles. Every title is a sparse TF-IDF vector over its
+# description plus its genres, cast and director; the k nearest neighbours of every
+# title are computed once and persisted, so a request is a row lookup.
+
+DEFAULT_LIMIT = 10
+MAX_NEIGHBORS = 20
+# Bump when the features or weights change
+INDEX_VERSION = 1
+
+DESCRIPTION_WEIGHT = 1.0
+ENTITY_WEIGHT = 1.0
+# Rows scored per block while building the index
+BLOCK_ROWS = 256
+
+df = netflix.df
+
+log = logging.getLogger(__name__)
+
+
+def _entities():
+    """Genre, cast and director tokens per title, taken from the bridge tables"""
+    docs = [[] for _ in range(len(df))]
+    for bridge, column, tag in ((netflix.title_genres, 'genre', 'g'), (netflix.title_cast, 'actor', 'c')):
+        for pos, value in zip(bridge['pos'].to_numpy(), bridge[column].to_numpy(dtype=object)):
+            docs[pos].append(f"{tag}:{value}")
+    for pos, director in enumerate(df['Main_director']):
+        if director not in netflix.PLACEHOLDERS:
+            docs[pos].append(f"d:{director}")
+    return docs
+
+
+def _identity(tokens):
+    return tokens
+
+
+def build_index(n_neighbors=MAX_NEIGHBORS):
+    """Nearest neighbours of every title: ``(neighbors, similarities)``, best first"""
+    # Only needed to build the index, which most boots load from disk instead
+    from scipy.sparse import hstack
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+
+    descriptions = TfidfVectorizer(stop_words='english', min_df=2, sublinear_tf=True, dtype=np.float32)
+    entities = TfidfVectorizer(analyzer=_identity, min_df=2, dtype=np.float32)
+    features = normalize(hstack([
+        descriptions.fit_transform(df['description'].fillna('')) * DESCRIPTION_WEIGHT,
+        entities.fit_transform(_entities()) * ENTITY_WEIGHT,
+    ]).tocsr())
+
+    # Cosine similarity of unit rows is a dot product; score a block of rows at a time
+    # and keep only each row's top k, so memory grows with the block, not with N^2
+    k = min(n_neighbors, len(df) - 1)
+    neighbors = np.empty((len(df), k), dtype=np.int32)
+    similarities = np.empty((len(df), k), dtype=np.float32)
+    if k == 0:
+        return neighbors, similarities
+    transposed = features.T.tocsr()
+    for start in range(0, len(df), BLOCK_ROWS):
+        end = min(start + BLOCK_ROWS, len(df))
+        scores = (features[start:end] @ transposed).toarray()
+        # A title is never its own neighbour
+        scores[np.arange(end - start), np.arange(start, end)] = -np.inf
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        # Best first; ties by row position so rebuilds are reproducible
+        order = np.lexsort((top, -top_scores), axis=1)
+        neighbors[start:end] = np.take_along_axis(top, order, axis=1)
+        similarities[start:end] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbors, similarities
+
+
+def _index_path():
+    source = datasets.source_path('netflix')
+    st = os.stat(source)
+    key = f"{st.st_size}-{st.st_mtime_ns}-{INDEX_VERSION}-{MAX_NEIGHBORS}"
+    return os.path.join(datasets.SNAPSHOT_DIR, f"similar-titles-{key}.joblib")
+
+
+def _load_index():
+    """Read the persisted neighbour table, building (and saving) it when missing"""
+    if df.empty:
+        return np.zeros((0, 0), dtype=np.int32), np.zeros((0, 0), dtype=np.float32)
+
+    path = _index_path() if datasets.USE_SNAPSHOTS else None
+    if path and os.path.exists(path):
+        try:
+            return joblib.load(path, mmap_mode='r')
+        except Exception:
+            pass  # Corrupt or incompatible file: rebuild
+
+    start = time.perf_counter()
+    index = build_index()
+    log.info("Built similar-titles index in %.2fs", time.perf_counter() - start)
+
+    if path:
+        try:
+            os.makedirs(datasets.SNAPSHOT_DIR, exist_ok=True)
+            for fname in os.listdir(datasets.SNAPSHOT_DIR):
+                if fname.startswith('similar-titles-') and not fname.endswith('.tmp'):
+                    os.remove(os.path.join(datasets.SNAPSHOT_DIR, fname))
+            # Temp file + rename so concurrent workers never read a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            joblib.dump(index, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Read-only filesystem: keep the in-memory index
+    return index
+
+
+neighbors, similarities = _load_index()
+
+
+def _find(title, title_type=None):
+    """Row position of a title: an exact match of any type before the closest fuzzy one"""
+    types = [title_type] if title_type else list(netflix.title_index)
+    key = fold(title)
+    for t in types:
+        pos = netflix.title_index.get(t, {}).get(key)
+        if pos is not None:
+            return pos, True
+    hits = [netflix.find_title(title, t) for t in types]
+    hits = [hit for hit in hits if hit[0] is not None]
+    return hits[0] if hits else (None, False)
+
+
+def _summary(pos):
+    row = df.iloc[pos]
+    return {
+        "title": row['title'],
+        "type": row['type'],
+        "release_year": int(row['release_year']),
+        "main_director": row['Main_director'],
+        "genres": [str(g) for g in netflix.genres_by_pos[pos]],
+    }
+
+
+def similar_titlesAPI(title, limit=DEFAULT_LIMIT, title_type=None):
+    """Titles most similar to ``title`` by description, genres, cast and director"""
+    pos, exact = _find(title.strip(), title_type.strip().lower() if title_type else None)
+    if pos is None:
+        return {
+            "message": f"No title found matching '{title}'."
+        }
+
+    similar = []
+    for j, score in zip(neighbors[pos][:limit], similarities[pos][:limit]):
+        record = _summary(int(j))
+        record["similarity"] = round(float(score), 3)
+        similar.append(record)
+
+    return dict(_summary(pos), exact_match=exact, similar=similar)
@@ -1,2 +1,4 @@
 #!/bin/bash
-gunicorn app:app --bind 0.0.0.0:$PORT
+# --preload loads the datasets (and runs the optional DARA_WARMUP pass) once in the
+# master process so forked workers share them copy-on-write
+gunicorn app:app --bind 0.0.0.0:$PORT --preload
@@ -0,0 +1,30 @@
+import re
+import unicodedata
+
+import numpy as np
+
+# Small text helpers shared by the search and autocomplete indexes.
+
+_TOKEN = re.compile(r'\w+')
+_MAX_CHAR = '\U0010ffff'
+
+
+def fold(text):
+    """Lower-case, strip accents and collapse whitespace so 'José  Pérez' matches 'jose perez'"""
+    text = str(text)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+
+def tokenize(folded):
+    """Word tokens of an already folded string"""
+    return _TOKEN.findall(folded)
+
+
+def prefix_range(sorted_values, prefix):
+    """Bounds ``lo, hi`` of the entries in a sorted string array that start with ``prefix``"""
+    lo = int(np.searchsorted(sorted_values, prefix, side='left'))
+    hi = int(np.searchsorted(sorted_values, prefix + _MAX_CHAR, side='left'))
+    return lo, hi